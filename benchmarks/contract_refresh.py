@@ -0,0 +1,121 @@
+"""Micro-benchmark for a full entity refresh of a MeinVodafone contract.
+
+Builds a contract from a typical usage payload and reads every value a
+sensor update touches (supported flag, value, last update, billing cycle
+and plan name), the same way MeinVodafoneSensor does.
+
+Usage:
+    python benchmarks/contract_refresh.py [--package-dir PATH] [--rounds N]
+"""
+
+from __future__ import annotations
+
+import argparse
+import importlib
+from pathlib import Path
+import sys
+import timeit
+import types
+
+PACKAGE_DIR = Path(__file__).resolve().parents[1] / "custom_components" / "meinvodafone"
+
+# (attr, plan name attr) of every sensor created by MeinVodafoneEntities
+SENSORS = [
+    ("minutes_remaining", "minutes_name"),
+    ("minutes_used", "minutes_name"),
+    ("minutes_total", "minutes_name"),
+    ("sms_remaining", "sms_name"),
+    ("sms_used", "sms_name"),
+    ("sms_total", "sms_name"),
+    ("data_remaining", "data_name"),
+    ("data_used", "data_name"),
+    ("data_total", "data_name"),
+    ("billing_current_summary", None),
+    ("billing_last_summary", None),
+    ("billing_cycle_days", None),
+]
+
+
+def load_package(package_dir: Path) -> types.ModuleType:
+    """Import the integration modules without running the package __init__.
+
+    The package __init__ requires Home Assistant, the contract does not.
+    """
+    package = types.ModuleType("meinvodafone")
+    package.__path__ = [str(package_dir)]
+    sys.modules["meinvodafone"] = package
+    return package
+
+
+def usage_payload(plans: int = 2) -> dict:
+    """Return a parsed usage payload with the given number of plans."""
+
+    def items(prefix: str, total: int) -> list[dict]:
+        return [
+            {
+                "name": f"{prefix} plan {index}",
+                "remaining": str(total - 10 * index),
+                "used": str(10 * index),
+                "total": str(total),
+                "last_update": f"2026-10-{10 + index:02d}T08:15:00",
+            }
+            for index in range(plans)
+        ]
+
+    return {
+        "billing": {
+            "current_summary": "12.34",
+            "last_summary": "23.45",
+            "cycle_start": "2026-10-01",
+            "cycle_end": "2026-10-31",
+        },
+        "minutes": items("Minutes", 1000),
+        "sms": items("SMS", 500),
+        "data": items("Data", 20480),
+    }
+
+
+def read_entities(contract: object) -> None:
+    """Read everything a full entity refresh reads."""
+    for attr, plan_name in SENSORS:
+        if not getattr(contract, f"is_{attr}_supported"):
+            continue
+        getattr(contract, attr)
+        getattr(contract, f"{attr}_last_update", None)
+        contract.billing_cycle_start  # noqa: B018
+        contract.billing_cycle_end  # noqa: B018
+        if plan_name:
+            getattr(contract, plan_name)
+
+
+def main() -> None:
+    """Run the benchmark."""
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--package-dir", type=Path, default=PACKAGE_DIR)
+    parser.add_argument("--rounds", type=int, default=20000)
+    parser.add_argument("--plans", type=int, default=2)
+    args = parser.parse_args()
+
+    load_package(args.package_dir)
+    contract_module = importlib.import_module("meinvodafone.MeinVodafoneContract")
+    payload = usage_payload(args.plans)
+
+    contract_cls = contract_module.MeinVodafoneContract
+    contract = contract_cls(contract_id="bench", usage_data=payload)
+
+    benchmarks = {
+        "build contract": lambda: contract_cls(contract_id="bench", usage_data=payload),
+        "read entities": lambda: read_entities(contract),
+        "full entity refresh": lambda: read_entities(
+            contract_cls(contract_id="bench", usage_data=payload)
+        ),
+    }
+
+    print(f"{args.plans} plans per container, {args.rounds} rounds")
+    for name, func in benchmarks.items():
+        best = min(timeit.repeat(func, repeat=5, number=args.rounds)) / args.rounds
+        print(f"{name:>20}: {best * 1e6:8.1f} us per contract")
+
+
+if __name__ == "__main__":
+    main()
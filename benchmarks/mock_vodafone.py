@@ -0,0 +1,209 @@
+"""In-process stand-in for the Vodafone endpoints used by the integration.
+
+Serves the login, hashing and unbilledUsage endpoints with configurable
+latency, error rate, session expiry and payload size, and counts every
+request, so refreshes can be measured without hitting the real service.
+
+The integration builds its URLs from MINT_HOST and API_HOST, point them at
+the server with patch_hosts().
+"""
+
+from __future__ import annotations
+
+import asyncio
+from collections import Counter
+import random
+import secrets
+import time
+import types
+
+from aiohttp import web
+
+SESSION_COOKIE = "mvf_session"
+
+LOGIN = "login"
+HASHING = "hashing"
+USAGE = "usage"
+
+
+def usage_response(contract_id: str, plans: int = 2) -> dict:
+    """Return an unbilledUsage response with the given number of plans."""
+
+    def group(container: str, unit: str, total: int) -> dict:
+        return {
+            "container": container,
+            "usage": [
+                {
+                    "name": f"{container} {contract_id} plan {index}",
+                    "remaining": str(total - 10 * index),
+                    "used": str(10 * index),
+                    "total": str(total),
+                    "unitOfMeasure": unit,
+                    "lastUpdateDate": f"2026-10-{10 + index % 20:02d}T08:15:00",
+                }
+                for index in range(plans)
+            ],
+        }
+
+    return {
+        "serviceUsageVBO": {
+            "billDetails": {
+                "currentSummary": {"amount": "12.34"},
+                "lastSummary": {"amount": "23.45"},
+                "billCycleStartDate": "2026-10-01",
+                "billCycleEndDate": "2026-10-31",
+            },
+            "usageAccounts": [
+                {
+                    "usageGroup": [
+                        group("Minuten", "Min", 1000),
+                        group("SMS", "SMS", 500),
+                        group("Daten", "MB", 20480),
+                    ]
+                }
+            ],
+        }
+    }
+
+
+class MockVodafoneServer:
+    """Fake Vodafone service running on a local port."""
+
+    def __init__(
+        self,
+        contracts: dict[str, list[str]],
+        latency: float = 0.05,
+        jitter: float = 0.0,
+        error_rate: float = 0.0,
+        session_lifetime: float | None = None,
+        plans: int = 2,
+    ) -> None:
+        """Initialize the server.
+
+        Args:
+            contracts: Contract ids of every username
+            latency: Seconds every response is delayed by
+            jitter: Maximum random seconds added to the latency
+            error_rate: Share of usage requests answered with 503
+            session_lifetime: Seconds until a session is answered with 401
+            plans: Plans per usage container, controls the payload size
+        """
+        self.contracts = contracts
+        self.latency = latency
+        self.jitter = jitter
+        self.error_rate = error_rate
+        self.session_lifetime = session_lifetime
+        self.plans = plans
+        self.requests: Counter[str] = Counter()
+        self.responses: Counter[int] = Counter()
+        self._sessions: dict[str, tuple[str, float]] = {}
+        self._payloads: dict[str, dict] = {}
+        self._runner: web.AppRunner | None = None
+        self.base_url = ""
+
+    async def start(self) -> str:
+        """Start the server and return its base URL."""
+        app = web.Application()
+        app.router.add_post("/mint/rest/v60/session/start", self._login)
+        app.router.add_get("/api/vluxgate/vlux/hashing", self._hashing)
+        app.router.add_get(
+            "/api/vluxgate/vlux/mobile/unbilledUsage/{contract_id}", self._usage
+        )
+        self._runner = web.AppRunner(app, access_log=None)
+        await self._runner.setup()
+        site = web.TCPSite(self._runner, "127.0.0.1", 0)
+        await site.start()
+        port = self._runner.addresses[0][1]
+        # A host name, the client cookie jar ignores cookies of IP addresses
+        self.base_url = f"http://localhost:{port}"
+        return self.base_url
+
+    async def stop(self) -> None:
+        """Stop the server."""
+        if self._runner:
+            await self._runner.cleanup()
+            self._runner = None
+
+    def reset_counters(self) -> None:
+        """Reset the request and response counters."""
+        self.requests.clear()
+        self.responses.clear()
+
+    def expire_sessions(self) -> None:
+        """Invalidate all sessions, the next requests are answered with 401."""
+        self._sessions.clear()
+
+    async def _delay(self) -> None:
+        """Simulate the service latency."""
+        delay = self.latency + random.uniform(0, self.jitter)
+        if delay > 0:
+            await asyncio.sleep(delay)
+
+    def _respond(self, status: int, data: dict | None = None) -> web.Response:
+        """Count and build a response."""
+        self.responses[status] += 1
+        if data is None:
+            return web.Response(status=status, text="error")
+        return web.json_response(data, status=status)
+
+    def _username(self, request: web.Request) -> str | None:
+        """Return the user of a valid session."""
+        session = self._sessions.get(request.cookies.get(SESSION_COOKIE, ""))
+        if session is None:
+            return None
+        username, started = session
+        if self.session_lifetime is not None:
+            if time.monotonic() - started > self.session_lifetime:
+                return None
+        return username
+
+    async def _login(self, request: web.Request) -> web.Response:
+        """Start a session, /mint/rest/v60/session/start."""
+        self.requests[LOGIN] += 1
+        await self._delay()
+        payload = await request.json()
+        username = payload.get("authnIdentifier")
+        if username not in self.contracts:
+            return self._respond(401)
+
+        token = secrets.token_hex(16)
+        self._sessions[token] = (username, time.monotonic())
+        response = self._respond(200, {"userId": username})
+        response.set_cookie(SESSION_COOKIE, token, path="/")
+        return response
+
+    async def _hashing(self, request: web.Request) -> web.Response:
+        """Return the contracts of the session user, /vluxgate/vlux/hashing."""
+        self.requests[HASHING] += 1
+        await self._delay()
+        if (username := self._username(request)) is None:
+            return self._respond(401)
+        return self._respond(
+            200,
+            {
+                "hashedIds": [
+                    {"id": contract_id, "type": "mobile"}
+                    for contract_id in self.contracts[username]
+                ]
+            },
+        )
+
+    async def _usage(self, request: web.Request) -> web.Response:
+        """Return the usage of a contract, /vluxgate/vlux/mobile/unbilledUsage."""
+        self.requests[USAGE] += 1
+        await self._delay()
+        if self._username(request) is None:
+            return self._respond(401)
+        if random.random() < self.error_rate:
+            return self._respond(503)
+
+        contract_id = request.match_info["contract_id"]
+        if contract_id not in self._payloads:
+            self._payloads[contract_id] = usage_response(contract_id, self.plans)
+        return self._respond(200, self._payloads[contract_id])
+
+
+def patch_hosts(api_module: types.ModuleType, base_url: str) -> None:
+    """Point the integration's API module at the mock server."""
+    api_module.MINT_HOST = f"{base_url}/mint"
+    api_module.API_HOST = f"{base_url}/api"
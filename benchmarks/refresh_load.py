@@ -0,0 +1,174 @@
+"""End-to-end load benchmark of account refreshes against the mock service.
+
+Drives MeinVodafoneAPIPool and the account coordinators against
+MockVodafoneServer for a growing number of contracts, and reports the
+refresh latency of the accounts, the requests sent and the logins done.
+The first round starts without sessions, the following rounds reuse them.
+
+Requires Home Assistant and aiohttp to be installed.
+
+Usage:
+    python benchmarks/refresh_load.py [--contracts 1 10 100 1000] [--rounds N]
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+from datetime import timedelta
+import math
+from pathlib import Path
+import sys
+import tempfile
+import time
+
+from mock_vodafone import LOGIN, MockVodafoneServer, patch_hosts
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+from homeassistant.core import HomeAssistant
+
+from custom_components.meinvodafone import MeinVodafoneAPI as api_module
+from custom_components.meinvodafone.const import DEFAULT_UPDATE_INTERVAL
+from custom_components.meinvodafone.MeinVodafoneAccountCoordinator import (
+    MeinVodafoneAccountCoordinator,
+)
+from custom_components.meinvodafone.MeinVodafoneAPIPool import (
+    MeinVodafoneAPIPool,
+)
+
+PASSWORD = "secret"
+
+
+def percentile(samples: list[float], share: float) -> float:
+    """Return the nearest-rank percentile of the samples."""
+    ordered = sorted(samples)
+    return ordered[max(0, math.ceil(share * len(ordered)) - 1)]
+
+
+def account_contracts(contracts: int, per_account: int) -> dict[str, list[str]]:
+    """Split the contracts into accounts."""
+    accounts: dict[str, list[str]] = {}
+    for index in range(contracts):
+        username = f"user{index // per_account}@example.com"
+        accounts.setdefault(username, []).append(f"contract{index:05d}")
+    return accounts
+
+
+async def refresh_account(
+    coordinator: MeinVodafoneAccountCoordinator, samples: list[float]
+) -> bool:
+    """Refresh all contracts of an account and record the latency."""
+    start = time.perf_counter()
+    try:
+        await coordinator.async_refresh_contracts(coordinator.contract_ids)
+    except Exception:  # noqa: BLE001
+        return False
+    samples.append(time.perf_counter() - start)
+    return all(
+        result.get("status_code") == 200 for result in (coordinator.data or {}).values()
+    )
+
+
+async def run_scenario(args: argparse.Namespace, contracts: int) -> dict[str, float]:
+    """Run all rounds for a number of contracts."""
+    accounts = account_contracts(contracts, args.contracts_per_account)
+    server = MockVodafoneServer(
+        accounts,
+        latency=args.latency,
+        jitter=args.jitter,
+        error_rate=args.error_rate,
+        session_lifetime=args.session_lifetime,
+        plans=args.plans,
+    )
+    patch_hosts(api_module, await server.start())
+
+    with tempfile.TemporaryDirectory() as config_dir:
+        hass = HomeAssistant(config_dir)
+        pool = MeinVodafoneAPIPool(
+            hass,
+            request_rate=args.request_rate,
+            request_burst=max(1, int(args.request_rate)),
+        )
+        await pool.async_load_sessions()
+
+        coordinators = []
+        for username, contract_ids in accounts.items():
+            coordinator = MeinVodafoneAccountCoordinator(
+                hass,
+                pool,
+                username,
+                PASSWORD,
+                timedelta(minutes=DEFAULT_UPDATE_INTERVAL),
+            )
+            for contract_id in contract_ids:
+                coordinator.add_contract(contract_id, PASSWORD)
+            coordinators.append(coordinator)
+
+        cold: list[float] = []
+        warm: list[float] = []
+        failures = 0
+        for round_index in range(args.rounds):
+            samples = cold if round_index == 0 else warm
+            results = await asyncio.gather(
+                *(refresh_account(coordinator, samples) for coordinator in coordinators)
+            )
+            failures += results.count(False)
+
+        stats = {
+            "accounts": len(accounts),
+            "cold p50": percentile(cold, 0.5) if cold else math.nan,
+            "warm p50": percentile(warm, 0.5) if warm else math.nan,
+            "warm p99": percentile(warm, 0.99) if warm else math.nan,
+            "requests": sum(server.requests.values()),
+            "logins": server.requests[LOGIN],
+            "failures": failures,
+        }
+
+        await pool.close_all()
+        await pool.connector.close()
+        await hass.async_stop(force=True)
+
+    await server.stop()
+    return stats
+
+
+async def main() -> None:
+    """Run the benchmark."""
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--contracts", type=int, nargs="+", default=[1, 10, 100, 1000])
+    parser.add_argument("--contracts-per-account", type=int, default=10)
+    parser.add_argument("--rounds", type=int, default=5)
+    parser.add_argument("--latency", type=float, default=0.05)
+    parser.add_argument("--jitter", type=float, default=0.02)
+    parser.add_argument("--error-rate", type=float, default=0.0)
+    parser.add_argument(
+        "--request-rate",
+        type=float,
+        default=10000.0,
+        help="request budget of the pool per second, the default does not limit",
+    )
+    parser.add_argument("--session-lifetime", type=float, default=None)
+    parser.add_argument("--plans", type=int, default=2)
+    args = parser.parse_args()
+
+    print(
+        f"{args.rounds} rounds, {args.contracts_per_account} contracts per account, "
+        f"latency {args.latency * 1000:.0f} ms, error rate {args.error_rate:.0%}"
+    )
+    print(
+        f"{'contracts':>9} {'accounts':>8} {'cold p50':>9} {'warm p50':>9} "
+        f"{'warm p99':>9} {'requests':>8} {'logins':>6} {'failures':>8}"
+    )
+    for contracts in args.contracts:
+        stats = await run_scenario(args, contracts)
+        print(
+            f"{contracts:>9} {stats['accounts']:>8} "
+            f"{stats['cold p50'] * 1000:>7.0f}ms {stats['warm p50'] * 1000:>7.0f}ms "
+            f"{stats['warm p99'] * 1000:>7.0f}ms {stats['requests']:>8} "
+            f"{stats['logins']:>6} {stats['failures']:>8}"
+        )
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -1,56 +1,217 @@
 """MeinVodafone API."""
 
+import asyncio
+from collections.abc import AsyncIterator
+from contextlib import asynccontextmanager
+from email.utils import parsedate_to_datetime
+from http.cookies import SimpleCookie
 import logging
+import random
 import time
-from typing import Any
+from typing import TYPE_CHECKING, Any
 
-from aiohttp import ClientError, ClientSession
+from aiohttp import ClientError, ClientSession, ContentTypeError
+from yarl import URL
 
 from .const import (
     API_HOST,
     API_TIMEOUT,
-    BILLING,
-    CURRENT_SUMMARY,
-    CYCLE_END,
-    CYCLE_START,
-    DATA,
     HEADER_REFERER,
-    LAST_SUMMARY,
-    LAST_UPDATE,
+    MAX_UPDATE_RETRY_COUNT,
     MINT_HOST,
-    MINUTES,
-    NAME,
-    REMAINING,
-    SMS,
-    TOTAL,
-    USED,
+    PRIORITY_BACKGROUND,
+    REQUEST_TIMEOUT,
+    RETRY_BASE_DELAY,
+    RETRY_MAX_DELAY,
     USER_AGENT,
     X_VF_CLIENT_ID,
 )
+from .MeinVodafoneMetrics import (
+    ENDPOINT_HASHING,
+    ENDPOINT_LOGIN,
+    ENDPOINT_USAGE,
+    PHASE_HTTP,
+    PHASE_JSON_DECODE,
+    PHASE_PARSE,
+    PHASE_QUEUE,
+    AccountMetrics,
+)
+from .MeinVodafoneParser import parse_unbilled_usage
+
+if TYPE_CHECKING:
+    from .MeinVodafoneAPIPool import CircuitBreaker, RequestBudget
 
 _LOGGER = logging.getLogger(__name__)
 
+# Status codes worth retrying, None stands for network errors and timeouts
+RETRY_STATUS_CODES = frozenset({None, 429, 500, 502, 503, 504})
+
+
+class RetryPolicy:
+    """Capped exponential backoff with full jitter."""
+
+    def __init__(
+        self,
+        max_retries: int = MAX_UPDATE_RETRY_COUNT,
+        base_delay: float = RETRY_BASE_DELAY,
+        max_delay: float = RETRY_MAX_DELAY,
+    ) -> None:
+        """Initialize the retry policy."""
+        self.max_retries = max_retries
+        self.base_delay = base_delay
+        self.max_delay = max_delay
+
+    @staticmethod
+    def is_transient(status_code: int | None) -> bool:
+        """Return true if a failed request may succeed when retried."""
+        return status_code in RETRY_STATUS_CODES
+
+    def delay(self, attempt: int, retry_after: float | None = None) -> float | None:
+        """Return the seconds to wait before the next attempt.
+
+        Args:
+            attempt: The number of the failed attempt, starting with 0
+            retry_after: The delay requested by the server, if any
+
+        Returns:
+            None if the server asked to wait longer than the maximum delay
+        """
+        if retry_after is not None:
+            if retry_after > self.max_delay:
+                return None
+            return max(retry_after, 0.0)
+        return random.uniform(0, min(self.max_delay, self.base_delay * 2**attempt))
+
+
+def parse_retry_after(value: str | None) -> float | None:
+    """Return the seconds of a Retry-After header (delay or HTTP date)."""
+    if not value:
+        return None
+    try:
+        return float(value)
+    except ValueError:
+        pass
+    try:
+        return parsedate_to_datetime(value).timestamp() - time.time()
+    except (TypeError, ValueError):
+        return None
+
+
+def _time_left(deadline: float) -> float:
+    """Return the seconds until a deadline in event loop time."""
+    return deadline - asyncio.get_running_loop().time()
+
+
+class _Flight:
+    """Fetch of a contract shared by concurrent callers."""
+
+    __slots__ = ("task", "waiters")
+
+    def __init__(self, task: "asyncio.Task[dict[str, Any]]") -> None:
+        """Initialize."""
+        self.task = task
+        self.waiters = 0
+
 
 class MeinVodafoneAPI:
     """Main MeinVodafone API class to MeinVodafone services."""
 
-    def __init__(self, username: str, password: str) -> None:
-        """Init MeinVodafone API class."""
+    def __init__(
+        self,
+        username: str,
+        password: str,
+        circuit_breaker: "CircuitBreaker | None" = None,
+        retry_policy: RetryPolicy | None = None,
+        session: ClientSession | None = None,
+        metrics: AccountMetrics | None = None,
+        request_budget: "RequestBudget | None" = None,
+        account_budget: "RequestBudget | None" = None,
+    ) -> None:
+        """Init MeinVodafone API class.
+
+        The session must have a cookie jar of its own, it holds the login.
+        Every request waits for the budget of the account and then for the
+        shared request budget, if they are given.
+        """
         self.username = username
         self.password = password
-        self.session = ClientSession()
+        self.session = session or ClientSession()
         self.is_authenticated = False
+        # Time of the login and of the latest request the session was valid for
+        self.session_started: float | None = None
+        self.session_confirmed: float | None = None
+        self.circuit_breaker = circuit_breaker
+        self.retry_policy = retry_policy or RetryPolicy()
+        self.metrics = metrics or AccountMetrics()
+        self.request_budget = request_budget
+        self.account_budget = account_budget
+        # Contract number -> running fetch of its usage
+        self._in_flight: dict[str, _Flight] = {}
+
+    def export_cookies(self) -> list[dict[str, str]]:
+        """Return the session cookies in a JSON serializable form."""
+        return [
+            {"domain": morsel["domain"], "cookie": morsel.OutputString()}
+            for morsel in self.session.cookie_jar
+        ]
+
+    def import_cookies(self, cookies: list[dict[str, str]]) -> None:
+        """Restore session cookies exported by export_cookies."""
+        for item in cookies:
+            cookie: SimpleCookie = SimpleCookie()
+            cookie.load(item["cookie"])
+            domain = item.get("domain", "").lstrip(".") or URL(MINT_HOST).host
+            self.session.cookie_jar.update_cookies(cookie, URL(f"https://{domain}/"))
 
     async def close(self) -> None:
         """Close the API session."""
+        for flight in self._in_flight.values():
+            flight.task.cancel()
         if self.session:
             await self.session.close()
         self.is_authenticated = False
 
-    async def login(self) -> bool:
-        """Start session API."""
+    @asynccontextmanager
+    async def _request_slot(self, priority: int) -> AsyncIterator[None]:
+        """Wait for the account and request budgets before sending a request.
+
+        Both are granted by priority, so interactive refreshes overtake the
+        queued background polls of the account as well.
+        """
+        budgets = [
+            budget
+            for budget in (self.account_budget, self.request_budget)
+            if budget is not None
+        ]
+        acquired: list["RequestBudget"] = []
+        try:
+            with self.metrics.measure(PHASE_QUEUE):
+                for budget in budgets:
+                    await budget.acquire(priority)
+                    acquired.append(budget)
+            yield
+        finally:
+            for budget in reversed(acquired):
+                budget.release()
+
+    async def login(
+        self, priority: int = PRIORITY_BACKGROUND, deadline: float | None = None
+    ) -> bool:
+        """Start session API.
+
+        Raises:
+            TimeoutError: The deadline (event loop time) passed
+        """
+        async with asyncio.timeout_at(deadline), self._request_slot(priority):
+            return await self._login()
+
+    async def _login(self) -> bool:
+        """Start session API, the request budget must be acquired."""
         _LOGGER.debug("Initiating new login for %s", self.username)
 
+        start = time.perf_counter()
+        status_code: int | None = None
+        body: bytes | None = None
         try:
             payload = {
                 "authnIdentifier": self.username,
@@ -67,24 +228,18 @@ class MeinVodafoneAPI:
             async with self.session.post(
                 url, headers=headers, json=payload, timeout=API_TIMEOUT
             ) as response:
-                _LOGGER.debug("Request URL: %s", url)
-                _LOGGER.debug("Request headers: %s", headers)
-                _LOGGER.debug("Response headers: %s", response.headers)
+                status_code = response.status
+                body = await response.read()
 
-                if response.status == 200:
+                if status_code == 200:
                     response_data = await response.json()
-                    _LOGGER.debug("Response: %s", response_data)
                     if response_data.get("userId"):
                         self.is_authenticated = True
+                        self.session_started = self.session_confirmed = time.time()
                         return True
                 else:
-                    response_text = await response.text()
                     _LOGGER.error("Failed to login")
-                    _LOGGER.debug(
-                        "Not success status code [%s] response: %s",
-                        response.status,
-                        response_text,
-                    )
+                    _LOGGER.debug("Not success status code [%s]", status_code)
                 self.is_authenticated = False
                 return False
         except ClientError as error:
@@ -95,14 +250,32 @@ class MeinVodafoneAPI:
             _LOGGER.error("Error during the login process: %s", error)
             self.is_authenticated = False
             return False
+        finally:
+            self.metrics.trace(
+                ENDPOINT_LOGIN, status_code, time.perf_counter() - start, body
+            )
+
+    async def get_contracts(
+        self, priority: int = PRIORITY_BACKGROUND, deadline: float | None = None
+    ) -> list[str]:
+        """Get contracts API.
+
+        Raises:
+            TimeoutError: The deadline (event loop time) passed
+        """
+        async with asyncio.timeout_at(deadline), self._request_slot(priority):
+            return await self._get_contracts()
 
-    async def get_contracts(self) -> list[str]:
-        """Get contracts API."""
+    async def _get_contracts(self) -> list[str]:
+        """Get contracts API, the request budget must be acquired."""
         _LOGGER.debug("Getting contracts")
 
         contracts: list[str] = []
         timestamp = f"{int(time.time())}"
 
+        start = time.perf_counter()
+        status_code: int | None = None
+        body: bytes | None = None
         try:
             url = f"{API_HOST}/vluxgate/vlux/hashing"
 
@@ -116,13 +289,11 @@ class MeinVodafoneAPI:
             async with self.session.get(
                 url, headers=headers, allow_redirects=False, timeout=API_TIMEOUT
             ) as response:
-                _LOGGER.debug("Request URL: %s", url)
-                _LOGGER.debug("Request headers: %s", headers)
-                _LOGGER.debug("Response headers: %s", response.headers)
+                status_code = response.status
+                body = await response.read()
 
-                if response.status == 200:
+                if status_code == 200:
                     response_data = await response.json()
-                    _LOGGER.debug("Response: %s", response_data)
                     contracts_data = response_data.get("hashedIds")
 
                     if contracts_data:
@@ -132,22 +303,31 @@ class MeinVodafoneAPI:
                                 if contract_number:
                                     contracts.append(contract_number)
                 else:
-                    response_text = await response.text()
                     _LOGGER.error("Failed to retrieve contracts")
-                    _LOGGER.debug(
-                        "Not success status code [%s] response: %s",
-                        response.status,
-                        response_text,
-                    )
+                    _LOGGER.debug("Not success status code [%s]", status_code)
         except ClientError as error:
             _LOGGER.error("Network error during contract retrieval: %s", error)
         except Exception as error:
             _LOGGER.error("Error during the contract retrieval process: %s", error)
+        finally:
+            self.metrics.trace(
+                ENDPOINT_HASHING, status_code, time.perf_counter() - start, body
+            )
 
         return contracts
 
-    async def get_contract_usage(self, contract_number: str) -> dict[str, Any]:
-        """Get usage data API."""
+    async def get_contract_usage(
+        self,
+        contract_number: str,
+        priority: int = PRIORITY_BACKGROUND,
+        deadline: float | None = None,
+    ) -> dict[str, Any]:
+        """Get usage data API, retrying transient failures.
+
+        Concurrent calls for the same contract share a single fetch, which
+        is cancelled only when all of its callers are cancelled. The fetch
+        ends by the deadline (event loop time) of the call which started it.
+        """
         if not contract_number:
             _LOGGER.error("Contract number is required")
             return {
@@ -155,15 +335,124 @@ class MeinVodafoneAPI:
                 "error_message": "Contract number is required",
             }
 
-        _LOGGER.debug("Getting contract usage details for %s", contract_number)
+        flight = self._in_flight.get(contract_number)
+        if flight is None:
+            flight = _Flight(
+                asyncio.create_task(
+                    self._fetch_contract_usage(contract_number, priority, deadline),
+                    name=f"meinvodafone usage {contract_number}",
+                )
+            )
+            self._in_flight[contract_number] = flight
+            flight.task.add_done_callback(
+                lambda _task, flight=flight: self._end_flight(contract_number, flight)
+            )
+        else:
+            _LOGGER.debug("Joining the running fetch of %s", contract_number)
+            self.metrics.coalesced += 1
+
+        flight.waiters += 1
+        try:
+            return await asyncio.shield(flight.task)
+        finally:
+            flight.waiters -= 1
+            if not flight.waiters and not flight.task.done():
+                # Every caller gave up on the fetch, later callers start anew
+                self._end_flight(contract_number, flight)
+                flight.task.cancel()
+
+    def _end_flight(self, contract_number: str, flight: _Flight) -> None:
+        """Stop sharing a fetch, unless a newer one took its place."""
+        if self._in_flight.get(contract_number) is flight:
+            del self._in_flight[contract_number]
+
+    async def _fetch_contract_usage(
+        self, contract_number: str, priority: int, deadline: float | None
+    ) -> dict[str, Any]:
+        """Get usage data API, retrying transient failures.
+
+        Every attempt waits for the request budget, the backoff does not
+        hold a request slot. No retry is started which cannot finish by the
+        deadline.
+        """
+        attempt = 0
+        while True:
+            if self.circuit_breaker and not self.circuit_breaker.allow_request():
+                _LOGGER.debug("Circuit open for %s, skipping request", self.username)
+                return {
+                    "status_code": None,
+                    "error_message": "Service unavailable, circuit is open",
+                }
+
+            data: dict[str, Any] | None = None
+            try:
+                async with asyncio.timeout_at(deadline), self._request_slot(priority):
+                    data = await self._get_contract_usage(contract_number, deadline)
+            except TimeoutError:
+                # The deadline passed while waiting for the request budget
+                return {
+                    "status_code": None,
+                    "error_message": "Deadline exceeded",
+                }
+            finally:
+                if data is None and self.circuit_breaker:
+                    # No outcome was recorded, a probe cancelled by the caller's
+                    # deadline must not keep the circuit half open forever
+                    self.circuit_breaker.release_probe()
+            status_code = data.get("status_code")
+            # Local failures are not the server's fault and do not repeat
+            # any better, only network errors and server statuses are retried
+            transient = data.get("retryable", True) and self.retry_policy.is_transient(
+                status_code
+            )
+
+            if self.circuit_breaker:
+                if transient:
+                    self.circuit_breaker.record_failure()
+                else:
+                    self.circuit_breaker.record_success()
+
+            if not transient:
+                return data
+
+            retry_after = data.get("retry_after")
+            delay = self.retry_policy.delay(attempt, retry_after)
+            if delay is None:
+                # Do not ask again before the server allows it
+                _LOGGER.debug(
+                    "Not retrying %s, asked to wait %.0f seconds",
+                    contract_number,
+                    retry_after,
+                )
+                if self.circuit_breaker:
+                    self.circuit_breaker.hold(retry_after)
+                return data
+            if attempt >= self.retry_policy.max_retries:
+                return data
+            if deadline is not None and _time_left(deadline) <= delay:
+                _LOGGER.debug("No time left to retry %s", contract_number)
+                return data
+            _LOGGER.debug(
+                "Retrying contract usage of %s in %.1f seconds (status %s)",
+                contract_number,
+                delay,
+                status_code,
+            )
+            await asyncio.sleep(delay)
+            attempt += 1
 
-        contract_usage_data: dict[str, Any] = {
-            BILLING: {},
-            MINUTES: [],
-            SMS: [],
-            DATA: [],
-        }
+    async def _get_contract_usage(
+        self, contract_number: str, deadline: float | None = None
+    ) -> dict[str, Any]:
+        """Get usage data API, single attempt.
 
+        The request budget must be acquired.
+        """
+        _LOGGER.debug("Getting contract usage details for %s", contract_number)
+
+        start = time.perf_counter()
+        status_code: int | None = None
+        body: bytes | None = None
         try:
             url = f"{API_HOST}/vluxgate/vlux/mobile/unbilledUsage/{contract_number}"
             timestamp = f"{int(time.time())}"
@@ -175,143 +464,70 @@ class MeinVodafoneAPI:
                 "X-Vf-Clientid": X_VF_CLIENT_ID,
             }
 
-            name_mapping = {
-                "minuten": MINUTES,
-                "sms": SMS,
-                "daten": DATA,
-                "d_eu_data": DATA,
-                "d_eu_flat_allnet_units": MINUTES,
-                "d_int_units": SMS,
-            }
-
-            async with self.session.get(
-                url, headers=headers, allow_redirects=False, timeout=API_TIMEOUT
-            ) as response:
-                _LOGGER.debug("Request URL: %s", url)
-                _LOGGER.debug("Request headers: %s", headers)
-                _LOGGER.debug("Response headers: %s", response.headers)
-
-                status_code = response.status
-
-                if status_code == 200:
-                    response_data = await response.json()
-                    _LOGGER.debug("Response: %s", response_data)
-                    service_usage_vbo = response_data.get("serviceUsageVBO", {})
-                    billing_details = service_usage_vbo.get("billDetails")
-
-                    if billing_details:
-                        billing_current_summary = billing_details.get(
-                            "currentSummary", {}
-                        ).get("amount")
-                        billing_last_summary = billing_details.get(
-                            "lastSummary", {}
-                        ).get("amount")
-                        billing_cycle_start = billing_details.get("billCycleStartDate")
-                        billing_cycle_end = billing_details.get("billCycleEndDate")
-
-                        contract_usage_data[BILLING] = {
-                            CURRENT_SUMMARY: billing_current_summary,
-                            LAST_SUMMARY: billing_last_summary,
-                            CYCLE_START: billing_cycle_start,
-                            CYCLE_END: billing_cycle_end,
+            timeout_at = asyncio.get_running_loop().time() + REQUEST_TIMEOUT
+            if deadline is not None:
+                timeout_at = min(timeout_at, deadline)
+            async with asyncio.timeout_at(timeout_at):
+                async with self.session.get(
+                    url, headers=headers, allow_redirects=False, timeout=API_TIMEOUT
+                ) as response:
+                    status_code = response.status
+                    # Read the body first, so decoding is timed on its own
+                    body = await response.read()
+                    self.metrics.record(PHASE_HTTP, time.perf_counter() - start)
+
+                    if status_code == 200:
+                        try:
+                            with self.metrics.measure(PHASE_JSON_DECODE):
+                                response_data = await response.json()
+                            with self.metrics.measure(PHASE_PARSE):
+                                contract_usage_data = parse_unbilled_usage(
+                                    response_data
+                                )
+                        except (
+                            ContentTypeError,
+                            ValueError,
+                            LookupError,
+                            TypeError,
+                            AttributeError,
+                        ) as error:
+                            # The body is already read, retrying gets the same
+                            _LOGGER.error(
+                                "Invalid contract usage details of %s: %s",
+                                contract_number,
+                                error,
+                            )
+                            return {
+                                "status_code": None,
+                                "error_message": f"Invalid response: {error}",
+                                "retryable": False,
+                            }
+                        self.session_confirmed = time.time()
+
+                        return {
+                            "status_code": status_code,
+                            "usage_data": contract_usage_data,
                         }
                     else:
-                        _LOGGER.debug("No billing details found, skipping.")
-
-                    usage_accounts = service_usage_vbo.get("usageAccounts", [])
-                    for account in usage_accounts:
-                        usage_group = account.get("usageGroup", [])
-                        for usage_data in usage_group:
-                            container = usage_data.get("container", "")
-                            container_name = name_mapping.get(container.lower())
-                            if container_name:
-                                aggregation = usage_data.get("vluxgateAgg")
-                                if aggregation:
-                                    # Handle aggregated usage data
-                                    last_update_time = None
-                                    usage_details = usage_data.get("usage", [])
-                                    unit_of_measure = "MB"
-
-                                    if usage_details:
-                                        last_update_time = usage_details[0].get(
-                                            "lastUpdateDate"
-                                        )
-                                        unit_of_measure = usage_details[0].get(
-                                            "unitOfMeasure", "MB"
-                                        )
-
-                                    remaining = aggregation.get("aggregateRemaining")
-                                    used = aggregation.get("aggregateUsed")
-                                    total = aggregation.get("aggregateTotal")
-
-                                    # Validate aggregated values
-                                    if not self._validate_usage_values(
-                                        remaining, used, total, unit_of_measure
-                                    ):
-                                        _LOGGER.debug(
-                                            "Skipping aggregated values with suspicious data"
-                                        )
-                                        continue
-
-                                    data = {
-                                        NAME: aggregation.get("name"),
-                                        REMAINING: remaining,
-                                        USED: used,
-                                        TOTAL: total,
-                                        LAST_UPDATE: last_update_time,
-                                    }
-                                    contract_usage_data[container_name].append(data)
-                                else:
-                                    # Handle individual usage items
-                                    usage_details = usage_data.get("usage", [])
-                                    for usage_item in usage_details:
-                                        unit_of_measure = usage_item.get(
-                                            "unitOfMeasure", "MB"
-                                        )
-                                        remaining = usage_item.get("remaining")
-                                        used = usage_item.get("used")
-                                        total = usage_item.get("total")
-
-                                        # Validate individual item values
-                                        if not self._validate_usage_values(
-                                            remaining, used, total, unit_of_measure
-                                        ):
-                                            _LOGGER.debug(
-                                                "Skipping usage item with suspicious values: %s",
-                                                usage_item.get("name"),
-                                            )
-                                            continue
-
-                                        data = {
-                                            NAME: usage_item.get("name"),
-                                            REMAINING: remaining,
-                                            USED: used,
-                                            TOTAL: total,
-                                            LAST_UPDATE: usage_item.get(
-                                                "lastUpdateDate"
-                                            ),
-                                        }
-                                        contract_usage_data[container_name].append(data)
-
-                    return {
-                        "status_code": status_code,
-                        "usage_data": contract_usage_data,
-                    }
-                else:
-                    response_text = await response.text()
-                    if status_code == 401:
-                        _LOGGER.debug("User appears unauthorized")
-                    else:
-                        _LOGGER.error("Failed to retrieve contract usage details")
-                    _LOGGER.debug(
-                        "Not success status code [%s] response: %s",
-                        status_code,
-                        response_text,
-                    )
-                    return {
-                        "status_code": status_code,
-                        "error_message": response_text,
-                    }
+                        response_text = await response.text()
+                        if status_code == 401:
+                            _LOGGER.debug("User appears unauthorized")
+                        else:
+                            _LOGGER.error("Failed to retrieve contract usage details")
+                            _LOGGER.debug("Not success status code [%s]", status_code)
+                        return {
+                            "status_code": status_code,
+                            "error_message": response_text,
+                            "retry_after": parse_retry_after(
+                                response.headers.get("Retry-After")
+                            ),
+                        }
+        except TimeoutError:
+            _LOGGER.debug("Timeout fetching data for contract %s", contract_number)
+            return {
+                "status_code": None,
+                "error_message": "Timeout fetching data",
+            }
         except ClientError as error:
             _LOGGER.error("Network error during contract usage retrieval: %s", error)
             return {
@@ -326,57 +542,9 @@ class MeinVodafoneAPI:
             return {
                 "status_code": None,
                 "error_message": str(error),
+                "retryable": False,
             }
-
-    def _validate_usage_values(
-        self, remaining: Any, used: Any, total: Any, unit: str
-    ) -> bool:
-        """Validate remaining, used, and total usage values.
-
-        Args:
-            remaining: The remaining value
-            used: The used value
-            total: The total value
-            unit: The unit of measure
-
-        Returns:
-            True if all values are valid, False otherwise
-        """
-        return all(
-            [
-                self._is_valid_data_value(remaining, unit),
-                self._is_valid_data_value(used, unit),
-                self._is_valid_data_value(total, unit),
-            ]
-        )
-
-    def _is_valid_data_value(self, value: str | int | None, unit: str) -> bool:
-        """Validate data values to detect incorrect/glitched values.
-
-        Args:
-            value: The numeric value as string or int
-            unit: The reported unit of measure
-
-        Returns:
-            True if value seems valid, False if suspicious
-        """
-        if value is None:
-            return True  # None is acceptable
-
-        try:
-            numeric_value = int(value)
-
-            # Flag suspicious values: if reported as MB but > 500000 (~500GB)
-            # it's likely a server glitch reporting KB as MB
-            if unit == "MB" and numeric_value > 500000:
-                _LOGGER.warning(
-                    "Ignoring suspicious data value: %s %s (likely server glitch)",
-                    numeric_value,
-                    unit,
-                )
-                return False
-
-            return True
-        except (ValueError, TypeError):
-            _LOGGER.warning("Invalid data value format: %s", value)
-            return False
+        finally:
+            self.metrics.trace(
+                ENDPOINT_USAGE, status_code, time.perf_counter() - start, body
+            )
@@ -3,25 +3,339 @@
 from __future__ import annotations
 
 import asyncio
+import heapq
+import itertools
 import logging
 import time
+from typing import Any
+
+from aiohttp import ClientSession, TCPConnector
+
+from homeassistant.const import EVENT_HOMEASSISTANT_CLOSE
+from homeassistant.core import Event, HomeAssistant, callback
+from homeassistant.helpers.storage import Store
+from homeassistant.util.ssl import get_default_context
 
 from .MeinVodafoneAPI import MeinVodafoneAPI
+from .MeinVodafoneMetrics import (
+    PHASE_LOGIN,
+    PHASE_LOGIN_DELAY,
+    PHASE_LOGIN_LOCK,
+    AccountMetrics,
+)
 from .const import (
+    CIRCUIT_FAILURE_THRESHOLD,
+    CIRCUIT_MAX_OPEN_TIME,
+    CIRCUIT_OPEN_TIME,
+    DNS_CACHE_TTL,
+    DOMAIN,
+    HTTP_CONNECTOR,
+    KEEPALIVE_TIMEOUT,
+    MAX_CONCURRENT_REQUESTS,
+    MAX_CONNECTIONS,
+    MAX_POOL_CONCURRENT_REQUESTS,
+    MEINVODAFONE_API_POOL,
     MIN_LOGIN_DELAY,
+    MIN_SESSION_LIFETIME,
+    PRIORITY_BACKGROUND,
+    REQUEST_BURST,
+    REQUEST_RATE,
+    SESSION_LIFETIME_TTL,
+    SESSION_RENEWAL_FACTOR,
+    SESSION_SAVE_DELAY,
+    STORAGE_VERSION,
 )
 
 _LOGGER = logging.getLogger(__name__)
 
+CIRCUIT_CLOSED = "closed"
+CIRCUIT_OPEN = "open"
+CIRCUIT_HALF_OPEN = "half_open"
+
+
+@callback
+def async_get_connector(
+    hass: HomeAssistant, limit: int = MAX_CONNECTIONS
+) -> TCPConnector:
+    """Return the connection pool shared by all MeinVodafone sessions.
+
+    All requests go to the same Vodafone hosts, so the sessions of all
+    accounts and config flows share kept-alive connections and cached DNS
+    lookups instead of opening a pool each.
+    """
+    domain_data = hass.data.setdefault(DOMAIN, {})
+    connector: TCPConnector | None = domain_data.get(HTTP_CONNECTOR)
+    if connector is not None and not connector.closed:
+        return connector
+
+    connector = TCPConnector(
+        limit=limit,
+        ttl_dns_cache=DNS_CACHE_TTL,
+        keepalive_timeout=KEEPALIVE_TIMEOUT,
+        ssl=get_default_context(),
+    )
+    domain_data[HTTP_CONNECTOR] = connector
+
+    async def _async_close_connector(event: Event) -> None:
+        """Close the connection pool."""
+        await connector.close()
+
+    hass.bus.async_listen_once(EVENT_HOMEASSISTANT_CLOSE, _async_close_connector)
+    return connector
+
+
+@callback
+def async_create_session(hass: HomeAssistant) -> ClientSession:
+    """Create a session with its own cookie jar on the shared connection pool."""
+    return ClientSession(connector=async_get_connector(hass), connector_owner=False)
+
+
+class CircuitBreaker:
+    """Stop sending requests of an account while Vodafone is failing.
+
+    After a number of consecutive transient failures the circuit opens and
+    requests are skipped. Once the open time has passed, a single probe
+    request is let through (half open). Its success closes the circuit,
+    its failure opens it again for twice the time.
+    """
+
+    def __init__(
+        self,
+        name: str,
+        failure_threshold: int = CIRCUIT_FAILURE_THRESHOLD,
+        open_time: float = CIRCUIT_OPEN_TIME,
+        max_open_time: float = CIRCUIT_MAX_OPEN_TIME,
+    ) -> None:
+        """Initialize the circuit breaker."""
+        self.name = name
+        self.failure_threshold = failure_threshold
+        self.base_open_time = open_time
+        self.max_open_time = max_open_time
+        self.state = CIRCUIT_CLOSED
+        self.failures = 0
+        self.open_time = open_time
+        self._opened_at = 0.0
+        self._probe_in_flight = False
+
+    @property
+    def is_available(self) -> bool:
+        """Return true if a request would currently be let through."""
+        if self.state == CIRCUIT_CLOSED:
+            return True
+        if self.state == CIRCUIT_HALF_OPEN:
+            return not self._probe_in_flight
+        return time.monotonic() - self._opened_at >= self.open_time
+
+    def allow_request(self) -> bool:
+        """Return true if a request may be sent now."""
+        if self.state == CIRCUIT_CLOSED:
+            return True
+
+        if not self.is_available:
+            return False
+
+        # Let a single probe request through
+        if self.state == CIRCUIT_OPEN:
+            _LOGGER.debug("Circuit of %s is half open, probing", self.name)
+            self.state = CIRCUIT_HALF_OPEN
+        self._probe_in_flight = True
+        return True
+
+    def release_probe(self) -> None:
+        """Let another request probe, the allowed one was never sent."""
+        self._probe_in_flight = False
+
+    def record_success(self) -> None:
+        """Record a request which reached the service."""
+        if self.state != CIRCUIT_CLOSED:
+            _LOGGER.info("Vodafone service recovered for %s", self.name)
+        self.state = CIRCUIT_CLOSED
+        self.failures = 0
+        self.open_time = self.base_open_time
+        self._probe_in_flight = False
+
+    def record_failure(self) -> None:
+        """Record a transient failure."""
+        if self.state == CIRCUIT_HALF_OPEN:
+            # The probe failed, back off further
+            self.open_time = min(self.open_time * 2, self.max_open_time)
+            self._open()
+            return
+
+        self.failures += 1
+        if self.state == CIRCUIT_CLOSED and self.failures >= self.failure_threshold:
+            self._open()
+
+    def hold(self, seconds: float) -> None:
+        """Pause requests for as long as the service asked to wait."""
+        now = time.monotonic()
+        if (
+            self.state == CIRCUIT_OPEN
+            and self._opened_at + self.open_time >= now + seconds
+        ):
+            return
+        self.open_time = seconds
+        self._open()
+
+    def _open(self) -> None:
+        """Open the circuit."""
+        _LOGGER.warning(
+            "Vodafone service unavailable for %s, pausing requests for %.0f seconds",
+            self.name,
+            self.open_time,
+        )
+        self.state = CIRCUIT_OPEN
+        self._opened_at = time.monotonic()
+        self._probe_in_flight = False
+
+
+class RequestBudget:
+    """Token bucket and priority queue in front of all Vodafone requests.
+
+    Tokens refill at the request rate up to the burst size and every
+    request takes one, so the pool never exceeds the rate on average.
+    Waiting requests are granted by priority, then in arrival order, so
+    interactive refreshes overtake queued background polls. Without a rate
+    only the in-flight requests are limited.
+    """
+
+    def __init__(
+        self,
+        rate: float | None = REQUEST_RATE,
+        burst: int = REQUEST_BURST,
+        max_concurrent_requests: int = MAX_POOL_CONCURRENT_REQUESTS,
+    ) -> None:
+        """Initialize a full bucket."""
+        self.rate = rate
+        self.burst = burst
+        self.max_concurrent_requests = max_concurrent_requests
+        self.active = 0
+        self._tokens = float(burst)
+        self._refilled_at = time.monotonic()
+        # (priority, arrival, future) of the waiting requests
+        self._waiters: list[tuple[int, int, asyncio.Future[None]]] = []
+        self._arrival = itertools.count()
+        self._wakeup: asyncio.TimerHandle | None = None
+
+    @property
+    def waiting(self) -> int:
+        """Return the number of queued requests."""
+        return sum(1 for *_, future in self._waiters if not future.done())
+
+    async def acquire(self, priority: int = PRIORITY_BACKGROUND) -> None:
+        """Wait until a request may be sent, release() must follow."""
+        if not self._waiters and self._try_take():
+            return
+
+        future: asyncio.Future[None] = asyncio.get_running_loop().create_future()
+        heapq.heappush(self._waiters, (priority, next(self._arrival), future))
+        self._dispatch()
+        try:
+            await future
+        except asyncio.CancelledError:
+            if future.done() and not future.cancelled():
+                # Granted just before the cancellation, pass it on
+                self.release()
+            raise
+
+    def release(self) -> None:
+        """Release the slot of a finished request."""
+        self.active -= 1
+        self._dispatch()
+
+    def _refill(self) -> None:
+        """Add the tokens earned since the last refill."""
+        now = time.monotonic()
+        self._tokens = min(
+            self.burst, self._tokens + (now - self._refilled_at) * self.rate
+        )
+        self._refilled_at = now
+
+    def _try_take(self) -> bool:
+        """Take a token and a slot if both are available."""
+        if self.active >= self.max_concurrent_requests:
+            return False
+        if self.rate is not None:
+            self._refill()
+            if self._tokens < 1:
+                return False
+            self._tokens -= 1
+        self.active += 1
+        return True
+
+    def _dispatch(self) -> None:
+        """Grant waiting requests in priority order while the budget allows."""
+        while self._waiters:
+            future = self._waiters[0][2]
+            if future.done():
+                # Cancelled while waiting
+                heapq.heappop(self._waiters)
+                continue
+            if not self._try_take():
+                break
+            heapq.heappop(self._waiters)
+            future.set_result(None)
+
+        if (
+            self._waiters
+            and self.rate is not None
+            and self._wakeup is None
+            and self.active < self.max_concurrent_requests
+        ):
+            # Out of tokens, continue once the next one is earned
+            self._wakeup = asyncio.get_running_loop().call_later(
+                (1 - self._tokens) / self.rate, self._on_wakeup
+            )
+
+    def _on_wakeup(self) -> None:
+        """Grant the requests waiting for tokens."""
+        self._wakeup = None
+        self._dispatch()
+
+    def cancel(self) -> None:
+        """Stop the refill timer."""
+        if self._wakeup is not None:
+            self._wakeup.cancel()
+            self._wakeup = None
+
 
 class MeinVodafoneAPIPool:
     """Pool to manage shared API sessions by username."""
 
-    def __init__(self) -> None:
-        """Initialize the API pool."""
+    def __init__(
+        self,
+        hass: HomeAssistant,
+        max_concurrent_requests: int = MAX_POOL_CONCURRENT_REQUESTS,
+        max_connections: int = MAX_CONNECTIONS,
+        request_rate: float = REQUEST_RATE,
+        request_burst: int = REQUEST_BURST,
+    ) -> None:
+        """Initialize the API pool.
+
+        Args:
+            hass: The Home Assistant instance, used to persist sessions
+            max_concurrent_requests: Limit of in-flight requests of all accounts
+            max_connections: Limit of open connections of the shared connector
+            request_rate: Requests per second of all accounts
+            request_burst: Requests sent at once before the rate applies
+        """
+        self.hass = hass
+        self.connector = async_get_connector(hass, max_connections)
+        self._session_store: Store[dict[str, Any]] = Store(
+            hass, STORAGE_VERSION, f"{DOMAIN}.sessions", private=True
+        )
+        self._saved_sessions: dict[str, dict[str, Any]] | None = None
         self._sessions: dict[str, MeinVodafoneAPI] = {}
         self._login_locks: dict[str, asyncio.Lock] = {}
         self._last_login_time: dict[str, float] = {}
+        self._circuit_breakers: dict[str, CircuitBreaker] = {}
+        self._metrics: dict[str, AccountMetrics] = {}
+        # Seconds a session is known to stay valid after the login
+        # (seconds, time learnt) of every account
+        self._session_lifetimes: dict[str, tuple[float, float]] = {}
+        self.request_budget = RequestBudget(
+            request_rate, request_burst, max_concurrent_requests
+        )
 
     def get_or_create(self, username: str, password: str) -> MeinVodafoneAPI:
         """Get existing API session or create new one.
@@ -38,65 +352,258 @@ class MeinVodafoneAPIPool:
             return self._sessions[username]
 
         _LOGGER.debug("Creating new API session for user: %s", username)
-        api = MeinVodafoneAPI(username, password)
+        api = MeinVodafoneAPI(
+            username,
+            password,
+            circuit_breaker=self.get_circuit_breaker(username),
+            session=async_create_session(self.hass),
+            metrics=self.get_metrics(username),
+            request_budget=self.request_budget,
+            # In-flight requests of the account, granted by priority
+            account_budget=RequestBudget(None, 0, MAX_CONCURRENT_REQUESTS),
+        )
         self._sessions[username] = api
 
+        # Optimistically reuse the session saved before the last restart,
+        # a 401 response falls back to a regular login
+        if saved_session := (self._saved_sessions or {}).get(username):
+            _LOGGER.debug("Restoring saved session for user: %s", username)
+            api.import_cookies(saved_session["cookies"])
+            api.is_authenticated = True
+            api.session_started = api.session_confirmed = saved_session.get("started")
+            if lifetime := saved_session.get("lifetime"):
+                self._session_lifetimes[username] = (
+                    lifetime,
+                    saved_session.get("lifetime_learnt") or 0.0,
+                )
+
         # Initialize lock for this username
         if username not in self._login_locks:
             self._login_locks[username] = asyncio.Lock()
 
         return api
 
-    async def ensure_authenticated(self, api: MeinVodafoneAPI, username: str) -> bool:
+    async def async_load_sessions(self) -> None:
+        """Load the sessions saved before the last restart."""
+        if self._saved_sessions is None:
+            self._saved_sessions = (await self._session_store.async_load()) or {}
+
+    @staticmethod
+    async def async_remove_saved_session(hass: HomeAssistant, username: str) -> None:
+        """Remove the saved session of an account which is no longer configured."""
+        if pool := hass.data.get(DOMAIN, {}).get(MEINVODAFONE_API_POOL):
+            (pool._saved_sessions or {}).pop(username, None)
+
+        store: Store[dict[str, Any]] = Store(
+            hass, STORAGE_VERSION, f"{DOMAIN}.sessions", private=True
+        )
+        saved_sessions = (await store.async_load()) or {}
+        if saved_sessions.pop(username, None) is not None:
+            await store.async_save(saved_sessions)
+
+    @callback
+    def async_schedule_save(self) -> None:
+        """Persist the session cookies of all accounts."""
+        self._session_store.async_delay_save(self._sessions_data, SESSION_SAVE_DELAY)
+
+    def _sessions_data(self) -> dict[str, Any]:
+        """Return the session cookies to persist."""
+        saved_sessions = self._saved_sessions or {}
+        saved_sessions.update(
+            {
+                username: self._session_data(username, api)
+                for username, api in self._sessions.items()
+                if api.is_authenticated
+            }
+        )
+        return saved_sessions
+
+    def _session_data(self, username: str, api: MeinVodafoneAPI) -> dict[str, Any]:
+        """Return the cookies and timing of a session to persist."""
+        lifetime = self._learnt_lifetime(username)
+        return {
+            "cookies": api.export_cookies(),
+            "started": api.session_started,
+            "lifetime": lifetime[0] if lifetime else None,
+            "lifetime_learnt": lifetime[1] if lifetime else None,
+        }
+
+    def get_circuit_breaker(self, username: str) -> CircuitBreaker:
+        """Get the circuit breaker of an account.
+
+        Args:
+            username: The username of the account
+
+        Returns:
+            The circuit breaker shared by all requests of the account
+        """
+        if username not in self._circuit_breakers:
+            self._circuit_breakers[username] = CircuitBreaker(username)
+        return self._circuit_breakers[username]
+
+    def get_metrics(self, username: str) -> AccountMetrics:
+        """Get the phase timings and counters of an account.
+
+        Args:
+            username: The username of the account
+
+        Returns:
+            The metrics shared by all requests of the account
+        """
+        if username not in self._metrics:
+            self._metrics[username] = AccountMetrics()
+        return self._metrics[username]
+
+    async def ensure_authenticated(
+        self,
+        api: MeinVodafoneAPI,
+        username: str,
+        priority: int = PRIORITY_BACKGROUND,
+        deadline: float | None = None,
+    ) -> bool:
         """Ensure API is authenticated, login only if needed.
 
+        A session which is about to expire is renewed right away, instead of
+        sending requests which would be answered with 401.
+
         Args:
             api: The API instance to check/authenticate
             username: The username (used for tracking)
+            priority: Priority of the login in the request budget
+            deadline: Event loop time the login must be done by
 
         Returns:
             True if authenticated, False otherwise
+
+        Raises:
+            TimeoutError: The deadline passed
         """
         # Get or create lock for this username
         if username not in self._login_locks:
             self._login_locks[username] = asyncio.Lock()
 
         lock = self._login_locks[username]
+        metrics = self.get_metrics(username)
+
+        start = time.perf_counter()
+        async with asyncio.timeout_at(deadline), lock:
+            metrics.record(PHASE_LOGIN_LOCK, time.perf_counter() - start)
 
-        async with lock:
             # Check if already authenticated
-            if api.is_authenticated:
+            if api.is_authenticated and not self._needs_renewal(api, username):
                 _LOGGER.debug("API session already authenticated for %s", username)
                 return True
 
-            # Check if we need to wait before next login
-            last_login = self._last_login_time.get(username, 0)
-            time_since_last = time.time() - last_login
+            return await self._async_login(api, username, priority, deadline)
+
+    @callback
+    def session_expired(self, api: MeinVodafoneAPI, username: str) -> None:
+        """Record a session which was rejected by the server.
 
-            if time_since_last < MIN_LOGIN_DELAY:
-                delay = MIN_LOGIN_DELAY - time_since_last
+        The session lifetime is learnt from the age of the latest request the
+        session was still valid for, so later sessions are renewed in time.
+        The lifetime is forgotten after a while, as a session may also be
+        ended early on the server, e.g. by a login in the Vodafone app.
+        """
+        if api.session_started is not None and api.session_confirmed is not None:
+            valid_for = api.session_confirmed - api.session_started
+            expired_at = time.time() - api.session_started
+            lifetime = self._learnt_lifetime(username)
+            if valid_for > 0:
+                if lifetime is None or expired_at < lifetime[0]:
+                    # First expiry, or the session expired earlier than expected
+                    seconds = valid_for
+                else:
+                    seconds = max(lifetime[0], valid_for)
+                seconds = max(seconds, MIN_SESSION_LIFETIME)
+                self._session_lifetimes[username] = (seconds, time.time())
                 _LOGGER.debug(
-                    "Rate limiting login for %s: waiting %.1f seconds", username, delay
+                    "Session of %s expired after %.0f seconds, renewing after %.0f",
+                    username,
+                    expired_at,
+                    seconds * SESSION_RENEWAL_FACTOR,
                 )
+
+        api.is_authenticated = False
+
+    def _learnt_lifetime(self, username: str) -> tuple[float, float] | None:
+        """Return the learnt session lifetime, None once it is outdated.
+
+        Without a lifetime sessions are used until they expire, so the
+        lifetime is learnt again and may grow.
+        """
+        lifetime = self._session_lifetimes.get(username)
+        if lifetime is not None and time.time() - lifetime[1] > SESSION_LIFETIME_TTL:
+            _LOGGER.debug("Learnt session lifetime of %s is outdated", username)
+            del self._session_lifetimes[username]
+            return None
+        return lifetime
+
+    def _needs_renewal(self, api: MeinVodafoneAPI, username: str) -> bool:
+        """Return true if a session is about to expire.
+
+        Sessions are only renewed when a request is due, never on a timer,
+        so polling slowly does not cause additional logins.
+        """
+        lifetime = self._learnt_lifetime(username)
+        if lifetime is None or api.session_started is None:
+            return False
+        return time.time() >= api.session_started + lifetime[0] * SESSION_RENEWAL_FACTOR
+
+    async def _async_login(
+        self,
+        api: MeinVodafoneAPI,
+        username: str,
+        priority: int = PRIORITY_BACKGROUND,
+        deadline: float | None = None,
+    ) -> bool:
+        """Log in, the login lock of the account must be held."""
+        metrics = self.get_metrics(username)
+
+        # Check if we need to wait before next login
+        last_login = self._last_login_time.get(username, 0)
+        time_since_last = time.time() - last_login
+
+        if time_since_last < MIN_LOGIN_DELAY:
+            delay = MIN_LOGIN_DELAY - time_since_last
+            if (
+                deadline is not None
+                and deadline - asyncio.get_running_loop().time() <= delay
+            ):
+                raise TimeoutError(f"No time left to log in {username}")
+            _LOGGER.debug(
+                "Rate limiting login for %s: waiting %.1f seconds", username, delay
+            )
+            with metrics.measure(PHASE_LOGIN_DELAY):
                 await asyncio.sleep(delay)
 
-            # Perform login
-            _LOGGER.debug("Performing login for user: %s", username)
-            result = await api.login()
+        # Perform login
+        _LOGGER.debug("Performing login for user: %s", username)
+        metrics.logins += 1
+        with metrics.measure(PHASE_LOGIN):
+            result = await api.login(priority, deadline)
+
+        # Update last login time
+        self._last_login_time[username] = time.time()
 
-            # Update last login time
-            self._last_login_time[username] = time.time()
+        if result:
+            self.async_schedule_save()
 
-            return result
+        return result
 
     async def close_all(self) -> None:
         """Close all API sessions in the pool."""
+        self.request_budget.cancel()
+        await self._session_store.async_save(self._sessions_data())
         for username, api in self._sessions.items():
             _LOGGER.debug("Closing API session for user: %s", username)
             await api.close()
         self._sessions.clear()
         self._login_locks.clear()
         self._last_login_time.clear()
+        self._circuit_breakers.clear()
+        self._metrics.clear()
+        self._session_lifetimes.clear()
 
     async def remove(self, username: str) -> None:
         """Remove and close a specific API session.
@@ -105,6 +612,11 @@ class MeinVodafoneAPIPool:
             username: The username of the session to remove
         """
         if username in self._sessions:
+            # Keep the session for a later reload of the account's entries
+            api = self._sessions[username]
+            if api.is_authenticated and self._saved_sessions is not None:
+                self._saved_sessions[username] = self._session_data(username, api)
+                self.async_schedule_save()
             _LOGGER.debug("Removing API session for user: %s", username)
             await self._sessions[username].close()
             del self._sessions[username]
@@ -114,3 +626,6 @@ class MeinVodafoneAPIPool:
             del self._login_locks[username]
         if username in self._last_login_time:
             del self._last_login_time[username]
+        self._circuit_breakers.pop(username, None)
+        self._metrics.pop(username, None)
+        self._session_lifetimes.pop(username, None)
@@ -0,0 +1,436 @@
+"""Account level coordinator for MeinVodafone integration."""
+
+from __future__ import annotations
+
+import asyncio
+from datetime import timedelta
+import logging
+import time
+from typing import Any
+
+from homeassistant.config_entries import SOURCE_INTEGRATION_DISCOVERY
+from homeassistant.const import CONF_PASSWORD, CONF_USERNAME
+from homeassistant.core import HomeAssistant, callback
+from homeassistant.exceptions import ConfigEntryAuthFailed
+from homeassistant.helpers import discovery_flow, issue_registry as ir
+from homeassistant.helpers.debounce import Debouncer
+from homeassistant.helpers.update_coordinator import DataUpdateCoordinator, UpdateFailed
+
+from .MeinVodafoneAPIPool import MeinVodafoneAPIPool
+from .MeinVodafoneMetrics import PHASE_CYCLE, PHASE_FETCH
+from .MeinVodafoneScheduler import MeinVodafoneScheduler, phase_offset
+from .const import (
+    CONTRACT_ID,
+    DISCOVERY_INTERVAL,
+    DOMAIN,
+    MAX_UPDATE_INTERVAL,
+    MIN_UPDATE_INTERVAL,
+    PRIORITY_BACKGROUND,
+    PRIORITY_INTERACTIVE,
+    REFRESH_DEBOUNCE,
+    UPDATE_DEADLINE,
+)
+
+_LOGGER = logging.getLogger(__name__)
+
+# Result of contracts which did not finish by the deadline of the cycle
+DEADLINE_RESULT: dict[str, Any] = {
+    "status_code": None,
+    "error_message": "Deadline exceeded",
+}
+
+# Result of contracts which are no longer on the account
+VANISHED_RESULT: dict[str, Any] = {
+    "status_code": None,
+    "error_message": "Contract is no longer on the account",
+}
+
+
+class MeinVodafoneAccountCoordinator(DataUpdateCoordinator[dict[str, dict[str, Any]]]):
+    """Class to fetch all contracts of one MeinVodafone login in a single cycle."""
+
+    def __init__(
+        self,
+        hass: HomeAssistant,
+        api_pool: MeinVodafoneAPIPool,
+        username: str,
+        password: str,
+        update_interval: timedelta,
+        min_update_interval: timedelta = timedelta(minutes=MIN_UPDATE_INTERVAL),
+        max_update_interval: timedelta = timedelta(minutes=MAX_UPDATE_INTERVAL),
+        discovery_interval: timedelta = timedelta(hours=DISCOVERY_INTERVAL),
+        update_deadline: timedelta = timedelta(seconds=UPDATE_DEADLINE),
+    ) -> None:
+        """Initialize.
+
+        The update interval is the starting point of the adaptive scheduler,
+        which keeps every contract's polling between the min and max bounds.
+        The contracts of the account are looked up every discovery interval.
+        Every cycle must finish within the update deadline.
+        """
+        self.api_pool = api_pool
+        self.api = api_pool.get_or_create(username, password)
+        self.metrics = api_pool.get_metrics(username)
+        self.username = username
+        self.contract_ids: list[str] = []
+        # Contracts of the account at the last discovery
+        self.discovered_contracts: set[str] | None = None
+        self.vanished_contracts: set[str] = set()
+        self.discovery_interval = discovery_interval.total_seconds()
+        self.update_deadline = update_deadline.total_seconds()
+        self._discovered_at = 0.0
+        self._announced_contracts: set[str] = set()
+        # Contracts requested through the refresh service
+        self._requested_contracts: set[str] = set()
+        self.scheduler = MeinVodafoneScheduler(
+            default_interval=update_interval.total_seconds(),
+            min_interval=min_update_interval.total_seconds(),
+            max_interval=max_update_interval.total_seconds(),
+        )
+
+        # The account coordinator outlives single config entries,
+        # so it must not be bound to the entry which created it.
+        super().__init__(
+            hass,
+            _LOGGER,
+            config_entry=None,
+            name=f"{DOMAIN} {username}",
+            update_interval=update_interval,
+        )
+
+        self._refresh_debouncer = Debouncer(
+            hass,
+            _LOGGER,
+            cooldown=REFRESH_DEBOUNCE,
+            immediate=False,
+            function=self._async_refresh_requested_contracts,
+        )
+
+    def add_contract(self, contract_id: str, password: str) -> None:
+        """Register a contract to be fetched on every cycle."""
+        if self.api.password != password:
+            # Credentials were updated by a reauth flow
+            _LOGGER.debug("Updating credentials for user: %s", self.username)
+            self.api.password = password
+            self.api.is_authenticated = False
+
+        if contract_id not in self.contract_ids:
+            self.contract_ids.append(contract_id)
+
+    def remove_contract(self, contract_id: str) -> bool:
+        """Unregister a contract.
+
+        Returns:
+            True if no contracts are left for this account
+        """
+        if contract_id in self.contract_ids:
+            self.contract_ids.remove(contract_id)
+        self.scheduler.remove(contract_id)
+        if contract_id in self.vanished_contracts:
+            self.vanished_contracts.discard(contract_id)
+            ir.async_delete_issue(self.hass, DOMAIN, _vanished_issue_id(contract_id))
+        self.metrics.last_fetch_latency.pop(contract_id, None)
+        if self.data and contract_id in self.data:
+            self.data = {k: v for k, v in self.data.items() if k != contract_id}
+        return not self.contract_ids
+
+    @property
+    def active_contract_ids(self) -> list[str]:
+        """Return the configured contracts which are still on the account."""
+        return [cid for cid in self.contract_ids if cid not in self.vanished_contracts]
+
+    @callback
+    def async_defer_contract(self, contract_id: str) -> None:
+        """Defer the first poll of a contract to the phase of the account.
+
+        Every account gets a deterministic phase within the update interval,
+        so restarts with many accounts do not send synchronized bursts.
+        """
+        now = time.time()
+        period = self.scheduler.default_interval
+        delay = (phase_offset(self.username, period) - now) % period
+        _LOGGER.debug("First poll of %s in %.0f seconds", contract_id, delay)
+        self.scheduler.defer(contract_id, now + delay, now)
+        self._async_reschedule(now)
+
+    @callback
+    def async_request_contracts_refresh(self, contract_ids: set[str]) -> None:
+        """Queue contracts for a refresh, requests are merged for a moment."""
+        self._requested_contracts.update(contract_ids)
+        self._refresh_debouncer.async_schedule_call()
+
+    async def _async_refresh_requested_contracts(self) -> None:
+        """Fetch all queued contracts in one batch and notify the contracts."""
+        contract_ids = [
+            cid for cid in self.contract_ids if cid in self._requested_contracts
+        ]
+        self._requested_contracts.clear()
+        if not contract_ids:
+            return
+
+        try:
+            await self.async_refresh_contracts(contract_ids)
+        except (ConfigEntryAuthFailed, UpdateFailed) as err:
+            self.async_set_update_error(err)
+            return
+        self.async_set_updated_data(self.data)
+
+    async def async_shutdown(self) -> None:
+        """Cancel queued refreshes."""
+        self._refresh_debouncer.async_shutdown()
+        self._requested_contracts.clear()
+        await super().async_shutdown()
+
+    async def async_refresh_contracts(
+        self, contract_ids: list[str], priority: int = PRIORITY_INTERACTIVE
+    ) -> None:
+        """Fetch the given contracts only and merge them into the account data.
+
+        Used for the initial refresh of a new entry and for manual entity
+        refreshes, so the other contracts of the account are not polled again.
+        Their requests overtake the queued requests of scheduled polls.
+        """
+        vanished = [cid for cid in contract_ids if cid in self.vanished_contracts]
+        with self.metrics.measure(PHASE_CYCLE):
+            results = await self._async_fetch_contracts(
+                [cid for cid in contract_ids if cid not in vanished],
+                priority,
+                self._deadline(),
+            )
+        self._schedule_contracts(results)
+        results.update(dict.fromkeys(vanished, VANISHED_RESULT))
+        self.data = {**(self.data or {}), **results}
+
+        # The refreshed contracts may now be due before the pending cycle
+        self._async_reschedule(time.time())
+
+    async def _async_update_data(self) -> dict[str, dict[str, Any]]:
+        """Fetch usage data for all due contracts of the account.
+
+        The whole cycle shares one deadline, contracts which did not finish
+        by then fail on their own while the others are published.
+        """
+        deadline = self._deadline()
+        await self._async_discover_contracts(deadline)
+
+        due = self.scheduler.due_contracts(self.active_contract_ids, time.time())
+        _LOGGER.debug(
+            "Starting data update for %s of %s contracts of %s",
+            len(due),
+            len(self.contract_ids),
+            self.username,
+        )
+        with self.metrics.measure(PHASE_CYCLE):
+            results = await self._async_fetch_contracts(
+                due, PRIORITY_BACKGROUND, deadline
+            )
+
+        self._schedule_contracts(results)
+
+        # Cookies may have been renewed by the server
+        self.api_pool.async_schedule_save()
+
+        # Contracts which were not due keep their previous result
+        return {
+            **(self.data or {}),
+            **results,
+            **dict.fromkeys(self.vanished_contracts, VANISHED_RESULT),
+        }
+
+    def _deadline(self) -> float:
+        """Return the deadline of a cycle starting now in event loop time."""
+        return self.hass.loop.time() + self.update_deadline
+
+    def _schedule_contracts(self, results: dict[str, dict[str, Any]]) -> None:
+        """Schedule the next poll of fetched contracts and the next cycle."""
+        now = time.time()
+        for contract_id, data in results.items():
+            if data.get("status_code") == 200:
+                self.scheduler.observe(contract_id, data.get("usage_data", {}), now)
+            else:
+                self.scheduler.failed(contract_id, now)
+
+        self.update_interval = timedelta(
+            seconds=self.scheduler.next_interval(self.active_contract_ids, now)
+        )
+
+    @callback
+    def _async_reschedule(self, now: float) -> None:
+        """Move the pending cycle to the next due contract."""
+        self.update_interval = timedelta(
+            seconds=self.scheduler.next_interval(self.active_contract_ids, now)
+        )
+        if self._listeners:
+            self._schedule_refresh()
+
+    async def _async_discover_contracts(self, deadline: float) -> None:
+        """Look up the contracts of the account once the cached list expired."""
+        if time.time() - self._discovered_at < self.discovery_interval:
+            return
+
+        circuit_breaker = self.api.circuit_breaker
+        if circuit_breaker and not circuit_breaker.is_available:
+            return
+
+        try:
+            if not await self.api_pool.ensure_authenticated(
+                self.api, self.username, PRIORITY_BACKGROUND, deadline
+            ):
+                raise ConfigEntryAuthFailed(
+                    f"Authentication failed for {self.username}"
+                )
+            contracts = await self.api.get_contracts(PRIORITY_BACKGROUND, deadline)
+        except TimeoutError:
+            # The usage fetch matters more, discover on the next cycle
+            _LOGGER.debug("Contract discovery of %s timed out", self.username)
+            return
+
+        if not contracts:
+            # Failed lookups return no contracts, keep the previous state
+            _LOGGER.debug("No contracts discovered for %s", self.username)
+            return
+
+        self._discovered_at = time.time()
+        self.discovered_contracts = set(contracts)
+        self._async_reconcile_contracts()
+
+    @callback
+    def _async_reconcile_contracts(self) -> None:
+        """Compare the discovered contracts with the configured ones.
+
+        Vanished contracts are not polled anymore and get a repair issue,
+        new contracts are offered through a discovery flow.
+        """
+        discovered = self.discovered_contracts or set()
+
+        for contract_id in self.contract_ids:
+            issue_id = _vanished_issue_id(contract_id)
+            if contract_id not in discovered:
+                if contract_id in self.vanished_contracts:
+                    continue
+                _LOGGER.warning(
+                    "Contract %s is no longer on the account, stopped polling",
+                    contract_id,
+                )
+                self.vanished_contracts.add(contract_id)
+                self.scheduler.remove(contract_id)
+                ir.async_create_issue(
+                    self.hass,
+                    DOMAIN,
+                    issue_id,
+                    is_fixable=False,
+                    severity=ir.IssueSeverity.WARNING,
+                    translation_key="contract_vanished",
+                    translation_placeholders={"contract_id": contract_id},
+                )
+            elif contract_id in self.vanished_contracts:
+                _LOGGER.info("Contract %s is back on the account", contract_id)
+                self.vanished_contracts.discard(contract_id)
+                ir.async_delete_issue(self.hass, DOMAIN, issue_id)
+
+        for contract_id in discovered - set(self.contract_ids):
+            if contract_id in self._announced_contracts:
+                continue
+            _LOGGER.debug("Discovered new contract %s", contract_id)
+            self._announced_contracts.add(contract_id)
+            discovery_flow.async_create_flow(
+                self.hass,
+                DOMAIN,
+                context={"source": SOURCE_INTEGRATION_DISCOVERY},
+                data={
+                    CONF_USERNAME: self.username,
+                    CONF_PASSWORD: self.api.password,
+                    CONTRACT_ID: contract_id,
+                },
+            )
+
+    async def _async_fetch_contracts(
+        self, contract_ids: list[str], priority: int, deadline: float
+    ) -> dict[str, dict[str, Any]]:
+        """Authenticate once and fetch all given contracts concurrently.
+
+        Every step gets the time left until the deadline (event loop time).
+        """
+        if not contract_ids:
+            return {}
+
+        circuit_breaker = self.api.circuit_breaker
+        if circuit_breaker and not circuit_breaker.is_available:
+            # Do not even log in while Vodafone is known to be failing
+            raise UpdateFailed(f"Vodafone service unavailable for {self.username}")
+
+        if not await self._async_authenticate(priority, deadline):
+            raise ConfigEntryAuthFailed(f"Authentication failed for {self.username}")
+
+        results = await self._async_gather_usage(contract_ids, priority, deadline)
+
+        expired = [
+            contract_id
+            for contract_id, data in results.items()
+            if data.get("status_code") == 401
+        ]
+        if expired:
+            _LOGGER.debug("Session expired, attempting re-login")
+
+            # Mark as unauthenticated and try again
+            self.api_pool.session_expired(self.api, self.username)
+            if not await self._async_authenticate(priority, deadline):
+                raise ConfigEntryAuthFailed(
+                    f"Authentication failed for {self.username}"
+                )
+
+            results.update(await self._async_gather_usage(expired, priority, deadline))
+            if any(
+                results[contract_id].get("status_code") == 401
+                for contract_id in expired
+            ):
+                raise ConfigEntryAuthFailed(
+                    f"Authentication failed for {self.username}"
+                )
+
+        return results
+
+    async def _async_authenticate(self, priority: int, deadline: float) -> bool:
+        """Log in if needed, a login which cannot finish fails the cycle."""
+        try:
+            return await self.api_pool.ensure_authenticated(
+                self.api, self.username, priority, deadline
+            )
+        except TimeoutError as err:
+            raise UpdateFailed(f"Timeout logging in {self.username}") from err
+
+    async def _async_gather_usage(
+        self, contract_ids: list[str], priority: int, deadline: float
+    ) -> dict[str, dict[str, Any]]:
+        """Fetch usage of several contracts limited by the concurrency limit."""
+        results = await asyncio.gather(
+            *(
+                self._async_get_contract_usage(contract_id, priority, deadline)
+                for contract_id in contract_ids
+            )
+        )
+        return dict(zip(contract_ids, results))
+
+    async def _async_get_contract_usage(
+        self, contract_id: str, priority: int, deadline: float
+    ) -> dict[str, Any]:
+        """Fetch usage of a single contract, cancelled at the deadline."""
+        start = time.perf_counter()
+        try:
+            async with asyncio.timeout_at(deadline):
+                result = await self.api.get_contract_usage(
+                    contract_id, priority, deadline
+                )
+        except TimeoutError:
+            _LOGGER.debug("Fetch of %s did not finish by the deadline", contract_id)
+            result = DEADLINE_RESULT
+
+        latency = time.perf_counter() - start
+        self.metrics.record(PHASE_FETCH, latency)
+        self.metrics.last_fetch_latency[contract_id] = latency
+        return result
+
+
+def _vanished_issue_id(contract_id: str) -> str:
+    """Return the id of the repair issue of a vanished contract."""
+    return f"contract_vanished_{contract_id}"
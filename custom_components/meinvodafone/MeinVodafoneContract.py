@@ -2,7 +2,7 @@
 
 import datetime
 import logging
-from typing import Any
+from typing import TYPE_CHECKING, Any, NamedTuple
 
 from .const import (
     BILLING,
@@ -20,313 +20,400 @@ from .const import (
     USED,
 )
 
+if TYPE_CHECKING:
+    from .MeinVodafoneForecast import UsageForecast
+
 _LOGGER = logging.getLogger(__name__)
 
 # Date format constants
-ISO_DATETIME_FORMAT = "%Y-%m-%dT%H:%M:%S"
 ISO_DATE_FORMAT = "%Y-%m-%d"
 
+USAGE_CONTAINERS = (MINUTES, SMS, DATA)
+USAGE_METRICS = (REMAINING, USED, TOTAL)
+
+# Values computed locally, their last update is the time of the computation
+LOCAL_VALUE_ATTRIBUTES = frozenset(
+    {
+        "billing_current_summary",
+        "billing_last_summary",
+        "billing_cycle_days",
+        "data_exhaustion",
+        "data_cycle_usage_forecast",
+        "data_daily_budget",
+    }
+)
+
+# Attribute names are resolved once at import time:
+# (container, name attr, [(metric, value attr, last update attr, supported attr)])
+_USAGE_ATTRIBUTES = [
+    (
+        container,
+        f"{container}_name",
+        [
+            (
+                metric,
+                f"{container}_{metric}",
+                f"{container}_{metric}_last_update",
+                f"is_{container}_{metric}_supported",
+            )
+            for metric in USAGE_METRICS
+        ],
+    )
+    for container in USAGE_CONTAINERS
+]
+
+
+class UsageItem(NamedTuple):
+    """Usage of a single plan, the field names match the usage metrics."""
+
+    remaining: int | None
+    used: int | None
+    total: int | None
+    last_update: datetime.datetime | None
+
+
+def _int(value: str | int | None) -> int | None:
+    """Return a usage value as int."""
+    return None if value is None else int(value)
+
+
+def _comparable_time(value: datetime.datetime) -> datetime.datetime:
+    """Return a timestamp comparable with both naive and aware ones.
+
+    The server sends timestamps with and without an offset, naive ones are
+    compared as UTC.
+    """
+    if value.tzinfo is None:
+        return value.replace(tzinfo=datetime.timezone.utc)
+    return value
+
 
 class MeinVodafoneContract:
-    """Init MeinVodafone contract class."""
+    """Immutable snapshot of a MeinVodafone contract.
+
+    All aggregates are computed once on construction, reading a value is a
+    plain attribute access. The usage items are indexed by container and
+    plan name, the aggregates of a container are summed from that table.
+    """
+
+    __slots__ = (
+        "contract_id",
+        "usage_data",
+        "usage_items",
+        "plan_names",
+        # MINUTES
+        "minutes_name",
+        "minutes_remaining",
+        "minutes_remaining_last_update",
+        "is_minutes_remaining_supported",
+        "minutes_used",
+        "minutes_used_last_update",
+        "is_minutes_used_supported",
+        "minutes_total",
+        "minutes_total_last_update",
+        "is_minutes_total_supported",
+        # SMS
+        "sms_name",
+        "sms_remaining",
+        "sms_remaining_last_update",
+        "is_sms_remaining_supported",
+        "sms_used",
+        "sms_used_last_update",
+        "is_sms_used_supported",
+        "sms_total",
+        "sms_total_last_update",
+        "is_sms_total_supported",
+        # DATA
+        "data_name",
+        "data_remaining",
+        "data_remaining_last_update",
+        "is_data_remaining_supported",
+        "data_used",
+        "data_used_last_update",
+        "is_data_used_supported",
+        "data_total",
+        "data_total_last_update",
+        "is_data_total_supported",
+        # BILLING
+        "billing_current_summary",
+        "billing_current_summary_last_update",
+        "is_billing_current_summary_supported",
+        "billing_last_summary",
+        "billing_last_summary_last_update",
+        "is_billing_last_summary_supported",
+        "billing_cycle_days",
+        "billing_cycle_days_last_update",
+        "is_billing_cycle_days_supported",
+        "billing_cycle_start",
+        "billing_cycle_end",
+        # FORECAST
+        "data_exhaustion",
+        "data_exhaustion_last_update",
+        "is_data_exhaustion_supported",
+        "data_cycle_usage_forecast",
+        "data_cycle_usage_forecast_last_update",
+        "is_data_cycle_usage_forecast_supported",
+        "data_daily_budget",
+        "data_daily_budget_last_update",
+        "is_data_daily_budget_supported",
+    )
+
+    contract_id: str
+    usage_data: dict[str, Any]
+    usage_items: dict[tuple[str, str], UsageItem]
+    plan_names: dict[str, tuple[str, ...]]
+
+    minutes_name: str | None
+    minutes_remaining: str | None
+    minutes_remaining_last_update: datetime.datetime | None
+    is_minutes_remaining_supported: bool
+    minutes_used: str | None
+    minutes_used_last_update: datetime.datetime | None
+    is_minutes_used_supported: bool
+    minutes_total: str | None
+    minutes_total_last_update: datetime.datetime | None
+    is_minutes_total_supported: bool
+
+    sms_name: str | None
+    sms_remaining: str | None
+    sms_remaining_last_update: datetime.datetime | None
+    is_sms_remaining_supported: bool
+    sms_used: str | None
+    sms_used_last_update: datetime.datetime | None
+    is_sms_used_supported: bool
+    sms_total: str | None
+    sms_total_last_update: datetime.datetime | None
+    is_sms_total_supported: bool
+
+    data_name: str | None
+    data_remaining: str | None
+    data_remaining_last_update: datetime.datetime | None
+    is_data_remaining_supported: bool
+    data_used: str | None
+    data_used_last_update: datetime.datetime | None
+    is_data_used_supported: bool
+    data_total: str | None
+    data_total_last_update: datetime.datetime | None
+    is_data_total_supported: bool
+
+    billing_current_summary: str | None
+    billing_current_summary_last_update: datetime.datetime
+    is_billing_current_summary_supported: bool
+    billing_last_summary: str | None
+    billing_last_summary_last_update: datetime.datetime
+    is_billing_last_summary_supported: bool
+    billing_cycle_days: int | None
+    billing_cycle_days_last_update: datetime.datetime
+    is_billing_cycle_days_supported: bool
+    billing_cycle_start: str | None
+    billing_cycle_end: str | None
+
+    data_exhaustion: datetime.datetime | None
+    data_exhaustion_last_update: datetime.datetime
+    is_data_exhaustion_supported: bool
+    data_cycle_usage_forecast: int | None
+    data_cycle_usage_forecast_last_update: datetime.datetime
+    is_data_cycle_usage_forecast_supported: bool
+    data_daily_budget: int | None
+    data_daily_budget_last_update: datetime.datetime
+    is_data_daily_budget_supported: bool
 
     def __init__(
         self,
         contract_id: str,
         usage_data: dict[str, Any],
+        forecast: "UsageForecast | None" = None,
     ) -> None:
-        """Initialize MeinVodafone contract."""
-        self.contract_id: str = contract_id
-        self.usage_data: dict[str, Any] = usage_data
-
-    def get_value(self, container: str, key: str | None = None) -> str | None:
-        """Return summarized value for the usage data."""
-        container_data = self.usage_data.get(container, [])
+        """Initialize MeinVodafone contract.
+
+        The forecast holds the trend of the used data including this snapshot.
+        """
+        set_value = object.__setattr__
+        now = datetime.datetime.now(datetime.timezone.utc)
+
+        set_value(self, "contract_id", contract_id)
+        set_value(self, "usage_data", usage_data)
+
+        usage_items: dict[tuple[str, str], UsageItem] = {}
+        plan_names: dict[str, tuple[str, ...]] = {}
+        set_value(self, "usage_items", usage_items)
+        set_value(self, "plan_names", plan_names)
+
+        for container, name_attr, metrics in _USAGE_ATTRIBUTES:
+            container_data = usage_data.get(container, [])
+            plans = self._index_items(container, container_data, usage_items)
+            plan_names[container] = plans
+            items = [usage_items[container, plan] for plan in plans]
+            # The display name joins the names as sent, the plan keys are
+            # only unique to address the items
+            names = [item[NAME] for item in container_data if item.get(NAME)]
+            set_value(self, name_attr, ", ".join(names) if container_data else None)
+            last_update = self._latest_update(items)
+
+            for metric, value_attr, last_update_attr, supported_attr in metrics:
+                value = self._aggregate_value(items, metric)
+                set_value(self, value_attr, value)
+                set_value(self, last_update_attr, last_update)
+                set_value(self, supported_attr, bool(value))
+
+        billing_data = usage_data.get(BILLING, {})
+        for key in (CURRENT_SUMMARY, LAST_SUMMARY):
+            value = billing_data.get(key)
+            set_value(self, f"billing_{key}", value)
+            set_value(self, f"billing_{key}_last_update", now)
+            set_value(self, f"is_billing_{key}_supported", bool(value))
+
+        cycle_end = billing_data.get(CYCLE_END)
+        set_value(self, "billing_cycle_start", billing_data.get(CYCLE_START))
+        set_value(self, "billing_cycle_end", cycle_end)
+        cycle_days = self._cycle_days(cycle_end, now)
+        set_value(self, "billing_cycle_days", cycle_days)
+        set_value(self, "billing_cycle_days_last_update", now)
+        set_value(self, "is_billing_cycle_days_supported", bool(cycle_end))
+
+        self._set_forecast(forecast, cycle_end, cycle_days, now)
+
+    def _set_forecast(
+        self,
+        forecast: "UsageForecast | None",
+        cycle_end: str | None,
+        cycle_days: int | None,
+        now: datetime.datetime,
+    ) -> None:
+        """Set the forecast of the data quota until the end of the cycle."""
+        set_value = object.__setattr__
+        total = int(self.data_total) if self.data_total else 0
+        cycle_end_time = self._cycle_end_time(cycle_end)
+        # Flat tariffs report a total of 0, there is nothing to run out of
+        supported = total > 0 and cycle_end_time is not None
+
+        exhaustion = usage_forecast = daily_budget = None
+        if supported and forecast is not None:
+            projected = forecast.project(cycle_end_time)
+            if projected is not None:
+                usage_forecast = round(projected)
+            exhaustion_time = forecast.exhaustion(total)
+            if exhaustion_time is not None and exhaustion_time <= cycle_end_time:
+                exhaustion = datetime.datetime.fromtimestamp(
+                    exhaustion_time, datetime.timezone.utc
+                )
+        if supported and self.data_remaining is not None and cycle_days is not None:
+            # The remaining data is shared by the days left including today
+            daily_budget = round(int(self.data_remaining) / (max(cycle_days, 0) + 1))
+
+        for attr, value in (
+            ("data_exhaustion", exhaustion),
+            ("data_cycle_usage_forecast", usage_forecast),
+            ("data_daily_budget", daily_budget),
+        ):
+            set_value(self, attr, value)
+            set_value(self, f"{attr}_last_update", now)
+            set_value(self, f"is_{attr}_supported", supported)
+
+    def __setattr__(self, name: str, value: Any) -> None:
+        """Reject changes, the contract is an immutable snapshot."""
+        raise AttributeError(f"{type(self).__name__} is immutable")
+
+    def usage_item(self, container: str, plan: str) -> UsageItem | None:
+        """Return the usage of a plan."""
+        return self.usage_items.get((container, plan))
+
+    @staticmethod
+    def _index_items(
+        container: str,
+        container_data: list[dict[str, Any]],
+        usage_items: dict[tuple[str, str], UsageItem],
+    ) -> tuple[str, ...]:
+        """Add the usage items of a container to the table.
+
+        Returns:
+            The plan names of the container in the order of the response
+        """
+        plans: list[str] = []
+        for item in container_data:
+            name = item.get(NAME) or container
+            plan = name
+            # Plans may be booked more than once, e.g. the same data pack
+            count = 1
+            while (container, plan) in usage_items:
+                count += 1
+                plan = f"{name} ({count})"
+
+            last_update = item.get(LAST_UPDATE)
+            if last_update is not None:
+                try:
+                    last_update = datetime.datetime.fromisoformat(last_update)
+                except (ValueError, TypeError) as err:
+                    _LOGGER.warning(
+                        "Failed to parse datetime from %s: %s - %s",
+                        container,
+                        last_update,
+                        err,
+                    )
+                    last_update = None
+
+            usage_items[container, plan] = UsageItem(
+                _int(item.get(REMAINING)),
+                _int(item.get(USED)),
+                _int(item.get(TOTAL)),
+                last_update,
+            )
+            plans.append(plan)
+        return tuple(plans)
 
-        if not container_data:
+    @staticmethod
+    def _aggregate_value(items: list[UsageItem], metric: str) -> str | None:
+        """Return summarized value of the usage items."""
+        if not items:
             return None
 
-        if key == NAME:
-            # Combine all names with a comma
-            return ", ".join(
-                [item.get(key, "") for item in container_data if item.get(key)]
-            )
-        if key == LAST_UPDATE:
-            # Filter out None values and get the latest last_update timestamp
-            valid_updates = [
-                item.get(key) for item in container_data if item.get(key) is not None
-            ]
-            if not valid_updates:
-                # Return the current datetime if no valid updates are found
-                return datetime.datetime.now(datetime.timezone.utc).strftime(
-                    ISO_DATETIME_FORMAT
-                )
-            return max(valid_updates)
-        # Summarize numerical values
-        total_value = sum(
-            int(item.get(key, 0))
-            for item in container_data
-            if item.get(key) is not None
+        return str(
+            sum(value for item in items if (value := getattr(item, metric)) is not None)
         )
-        return str(total_value)
-
-    def get_billing_value(self, key: str) -> str | None:
-        """Return value from the billing information."""
-        billing_data = self.usage_data.get(BILLING, {})
-        return billing_data.get(key)
-
-    def _get_datetime_from_value(
-        self, container: str, key: str
-    ) -> datetime.datetime | None:
-        """Get datetime object from container value."""
-        value = self.get_value(container, key)
-        if value is None:
+
+    @staticmethod
+    def _latest_update(items: list[UsageItem]) -> datetime.datetime | None:
+        """Return the latest update timestamp of the usage items."""
+        if not items:
             return None
-        try:
-            return datetime.datetime.fromisoformat(value)
-        except (ValueError, TypeError) as err:
-            _LOGGER.warning(
-                "Failed to parse datetime from %s: %s - %s", container, value, err
+
+        valid_updates = [item.last_update for item in items if item.last_update]
+        if not valid_updates:
+            # Use the current datetime if no valid updates are found
+            return datetime.datetime.now(datetime.timezone.utc).replace(
+                microsecond=0, tzinfo=None
             )
+        return max(valid_updates, key=_comparable_time)
+
+    @staticmethod
+    def _cycle_end_time(cycle_end: str | None) -> float | None:
+        """Return the timestamp when the billing cycle ends."""
+        if not cycle_end:
             return None
 
-    def _create_usage_properties(self, container: str, metric_name: str):
-        """Helper to reduce duplication (not directly implemented as Python lacks macros)."""
-        # This is a conceptual helper - actual implementation would require
-        # dynamic property generation or metaclass usage
-        pass
-
-    #
-    # MINUTES
-    #
-
-    @property
-    def minutes_name(self) -> str | None:
-        """Return name of the plan."""
-        return self.get_value(MINUTES, NAME)
-
-    @property
-    def minutes_remaining(self) -> str | None:
-        """Return remaining minutes for the plan."""
-        return self.get_value(MINUTES, REMAINING)
-
-    @property
-    def minutes_remaining_last_update(self) -> datetime.datetime | None:
-        """Return remaining minutes for the plan last update timestamp."""
-        return self._get_datetime_from_value(MINUTES, LAST_UPDATE)
-
-    @property
-    def is_minutes_remaining_supported(self) -> bool:
-        """Return true if remaining minutes for the plan is supported."""
-        return bool(self.get_value(MINUTES, REMAINING))
-
-    @property
-    def minutes_used(self) -> str | None:
-        """Return used minutes for the plan."""
-        return self.get_value(MINUTES, USED)
-
-    @property
-    def minutes_used_last_update(self) -> datetime.datetime | None:
-        """Return used minutes for the plan last update timestamp."""
-        return self._get_datetime_from_value(MINUTES, LAST_UPDATE)
-
-    @property
-    def is_minutes_used_supported(self) -> bool:
-        """Return true if used minutes for the plan is supported."""
-        return bool(self.get_value(MINUTES, USED))
-
-    @property
-    def minutes_total(self) -> str | None:
-        """Return total minutes for the plan."""
-        return self.get_value(MINUTES, TOTAL)
-
-    @property
-    def minutes_total_last_update(self) -> datetime.datetime | None:
-        """Return total minutes for the plan last update timestamp."""
-        return self._get_datetime_from_value(MINUTES, LAST_UPDATE)
-
-    @property
-    def is_minutes_total_supported(self) -> bool:
-        """Return true if total minutes for the plan is supported."""
-        return bool(self.get_value(MINUTES, TOTAL))
-
-    #
-    # SMS
-    #
-
-    @property
-    def sms_name(self) -> str | None:
-        """Return name of the primary plan."""
-        return self.get_value(SMS, NAME)
-
-    @property
-    def sms_remaining(self) -> str | None:
-        """Return remaining sms for the plan."""
-        return self.get_value(SMS, REMAINING)
-
-    @property
-    def sms_remaining_last_update(self) -> datetime.datetime | None:
-        """Return remaining sms for the plan last update timestamp."""
-        return self._get_datetime_from_value(SMS, LAST_UPDATE)
-
-    @property
-    def is_sms_remaining_supported(self) -> bool:
-        """Return true if remaining sms for the plan is supported."""
-        return bool(self.get_value(SMS, REMAINING))
-
-    @property
-    def sms_used(self) -> str | None:
-        """Return used sms for the plan."""
-        return self.get_value(SMS, USED)
-
-    @property
-    def sms_used_last_update(self) -> datetime.datetime | None:
-        """Return used sms for the plan last update timestamp."""
-        return self._get_datetime_from_value(SMS, LAST_UPDATE)
-
-    @property
-    def is_sms_used_supported(self) -> bool:
-        """Return true if used sms for the plan is supported."""
-        return bool(self.get_value(SMS, USED))
-
-    @property
-    def sms_total(self) -> str | None:
-        """Return total sms for the plan."""
-        return self.get_value(SMS, TOTAL)
-
-    @property
-    def sms_total_last_update(self) -> datetime.datetime | None:
-        """Return total sms for the plan last update timestamp."""
-        return self._get_datetime_from_value(SMS, LAST_UPDATE)
-
-    @property
-    def is_sms_total_supported(self) -> bool:
-        """Return true if total sms for the plan is supported."""
-        return bool(self.get_value(SMS, TOTAL))
-
-    #
-    # DATA
-    #
-
-    @property
-    def data_name(self) -> str | None:
-        """Return name of the plan."""
-        return self.get_value(DATA, NAME)
-
-    @property
-    def data_remaining(self) -> str | None:
-        """Return remaining data for the plan."""
-        return self.get_value(DATA, REMAINING)
-
-    @property
-    def data_remaining_last_update(self) -> datetime.datetime | None:
-        """Return remaining data for the plan last update timestamp."""
-        return self._get_datetime_from_value(DATA, LAST_UPDATE)
-
-    @property
-    def is_data_remaining_supported(self) -> bool:
-        """Return true if remaining data for the plan is supported."""
-        return bool(self.get_value(DATA, REMAINING))
-
-    @property
-    def data_used(self) -> str | None:
-        """Return used data for the plan."""
-        return self.get_value(DATA, USED)
-
-    @property
-    def data_used_last_update(self) -> datetime.datetime | None:
-        """Return used data for the plan last update timestamp."""
-        return self._get_datetime_from_value(DATA, LAST_UPDATE)
-
-    @property
-    def is_data_used_supported(self) -> bool:
-        """Return true if used data for the plan is supported."""
-        return bool(self.get_value(DATA, USED))
-
-    @property
-    def data_total(self) -> str | None:
-        """Return total data for the plan."""
-        return self.get_value(DATA, TOTAL)
-
-    @property
-    def data_total_last_update(self) -> datetime.datetime | None:
-        """Return total data for the plan last update timestamp."""
-        return self._get_datetime_from_value(DATA, LAST_UPDATE)
-
-    @property
-    def is_data_total_supported(self) -> bool:
-        """Return true if total data for the plan is supported."""
-        return bool(self.get_value(DATA, TOTAL))
-
-    #
-    # BILLING
-    #
-
-    @property
-    def billing_current_summary(self) -> str | None:
-        """Return current billing summary."""
-        return self.get_billing_value(CURRENT_SUMMARY)
-
-    @property
-    def billing_current_summary_last_update(self) -> datetime.datetime:
-        """Return current billing summary last update timestamp."""
-        return datetime.datetime.now(datetime.timezone.utc)
-
-    @property
-    def is_billing_current_summary_supported(self) -> bool:
-        """Return true if current billing summary is supported."""
-        return bool(self.get_billing_value(CURRENT_SUMMARY))
-
-    @property
-    def billing_last_summary(self) -> str | None:
-        """Return last billing summary."""
-        return self.get_billing_value(LAST_SUMMARY)
-
-    @property
-    def billing_last_summary_last_update(self) -> datetime.datetime:
-        """Return last billing summary last update timestamp."""
-        return datetime.datetime.now(datetime.timezone.utc)
-
-    @property
-    def is_billing_last_summary_supported(self) -> bool:
-        """Return true if last billing summary is supported."""
-        return bool(self.get_billing_value(LAST_SUMMARY))
-
-    @property
-    def billing_cycle_days(self) -> int | None:
+        try:
+            cycle_end_date = datetime.date.fromisoformat(cycle_end)
+        except (ValueError, TypeError):
+            return None
+        return datetime.datetime.combine(
+            cycle_end_date + datetime.timedelta(days=1),
+            datetime.time(),
+            tzinfo=datetime.timezone.utc,
+        ).timestamp()
+
+    @staticmethod
+    def _cycle_days(cycle_end: str | None, now: datetime.datetime) -> int | None:
         """Return days until end of the billing cycle."""
-        if not self.billing_cycle_end:
+        if not cycle_end:
             return None
 
         try:
-            datetime_now = datetime.datetime.now(datetime.timezone.utc).replace(
-                hour=0, minute=0, second=0, microsecond=0
-            )
-            cycle_end = datetime.datetime.strptime(
-                self.billing_cycle_end, ISO_DATE_FORMAT
+            datetime_now = now.replace(hour=0, minute=0, second=0, microsecond=0)
+            cycle_end_date = datetime.datetime.strptime(
+                cycle_end, ISO_DATE_FORMAT
             ).replace(tzinfo=datetime.timezone.utc)
-            delta = cycle_end - datetime_now
+            delta = cycle_end_date - datetime_now
             return delta.days
         except (ValueError, TypeError) as err:
             _LOGGER.warning("Failed to calculate billing cycle days: %s", err)
             return None
-
-    @property
-    def billing_cycle_days_last_update(self) -> datetime.datetime:
-        """Return days until end of the billing cycle last update timestamp."""
-        return datetime.datetime.now(datetime.timezone.utc)
-
-    @property
-    def is_billing_cycle_days_supported(self) -> bool:
-        """Return true if days until end of the billing cycle is supported."""
-        return bool(self.billing_cycle_end)
-
-    @property
-    def billing_cycle_start(self) -> str | None:
-        """Return billing cycle start date."""
-        return self.get_billing_value(CYCLE_START)
-
-    @property
-    def billing_cycle_end(self) -> str | None:
-        """Return billing cycle end date."""
-        return self.get_billing_value(CYCLE_END)
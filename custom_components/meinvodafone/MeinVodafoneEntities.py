@@ -6,8 +6,9 @@ from homeassistant.components.sensor import SensorDeviceClass, SensorStateClass
 from homeassistant.components.sensor.const import UnitOfInformation, UnitOfTime
 from homeassistant.const import CURRENCY_EURO
 from homeassistant.helpers.entity import EntityCategory
+from homeassistant.util import slugify
 
-from .MeinVodafoneContract import MeinVodafoneContract
+from .MeinVodafoneContract import USAGE_METRICS, MeinVodafoneContract
 
 _LOGGER = logging.getLogger(__name__)
 
@@ -26,6 +27,7 @@ class BaseEntity:
         device_class: str | None = None,
         state_class: str | None = None,
         display_precision: int | None = None,
+        enabled_default: bool = True,
     ) -> None:
         """Init."""
         self.attr = attr
@@ -37,6 +39,7 @@ class BaseEntity:
         self.device_class = device_class
         self.state_class = state_class
         self.display_precision = display_precision
+        self.enabled_default = enabled_default
         self.contract: MeinVodafoneContract | None = None
 
     def setup(self, contract: MeinVodafoneContract) -> bool:
@@ -75,6 +78,7 @@ class Sensor(BaseEntity):
         device_class: SensorDeviceClass | None = None,
         state_class: SensorStateClass | None = None,
         display_precision: int | None = None,
+        enabled_default: bool = True,
     ) -> None:
         """Init."""
         super().__init__(
@@ -87,10 +91,49 @@ class Sensor(BaseEntity):
             device_class=device_class,
             state_class=state_class,
             display_precision=display_precision,
+            enabled_default=enabled_default,
         )
         self.unit = unit
 
 
+class PlanSensor(Sensor):
+    """Sensor of a single plan of a usage container.
+
+    Disabled by default, the aggregate sensor of the container sums up all
+    of its plans.
+    """
+
+    def __init__(
+        self, template: Sensor, container: str, metric: str, plan: str, key: str
+    ):
+        """Init from the aggregate sensor of the container and metric.
+
+        The key identifies the plan within the container in the entity id.
+        """
+        super().__init__(
+            attr=f"{template.attr}_{key}",
+            name=f"{template.name} {plan}",
+            icon=template.icon,
+            unit=template.unit,
+            device_class=template.device_class,
+            state_class=template.state_class,
+            display_precision=template.display_precision,
+            enabled_default=False,
+        )
+        self.container = container
+        self.metric = metric
+        self.plan = plan
+
+    @property
+    def is_supported(self) -> bool:
+        """Check the plan reports the metric."""
+        if not self.contract:
+            return False
+
+        item = self.contract.usage_item(self.container, self.plan)
+        return item is not None and getattr(item, self.metric) is not None
+
+
 def create_entities() -> list[Sensor]:
     """Return list of all entities."""
     return [
@@ -175,6 +218,33 @@ def create_entities() -> list[Sensor]:
             plan_name="data_name",
             state_class=SensorStateClass.MEASUREMENT,
         ),
+        # Forecast sensors
+        Sensor(
+            attr="data_exhaustion",
+            name="Data exhaustion forecast",
+            icon="mdi:calendar-alert",
+            unit=None,
+            device_class=SensorDeviceClass.TIMESTAMP,
+            plan_name="data_name",
+        ),
+        Sensor(
+            attr="data_cycle_usage_forecast",
+            name="Data usage forecast",
+            icon="mdi:chart-line",
+            unit=UnitOfInformation.MEBIBYTES,
+            device_class=SensorDeviceClass.DATA_SIZE,
+            plan_name="data_name",
+            state_class=SensorStateClass.MEASUREMENT,
+        ),
+        Sensor(
+            attr="data_daily_budget",
+            name="Data daily budget",
+            icon="mdi:calendar-today",
+            unit=f"{UnitOfInformation.MEBIBYTES}/d",
+            plan_name="data_name",
+            state_class=SensorStateClass.MEASUREMENT,
+            display_precision=0,
+        ),
         # Billing sensors
         Sensor(
             attr="billing_current_summary",
@@ -201,6 +271,69 @@ def create_entities() -> list[Sensor]:
     ]
 
 
+def create_diagnostic_entities() -> list[Sensor]:
+    """Return list of the refresh diagnostics entities.
+
+    Their values are read from the account metrics instead of the contract.
+    """
+    return [
+        Sensor(
+            attr="last_fetch_latency",
+            name="Last fetch latency",
+            icon="mdi:timer-outline",
+            unit=UnitOfTime.MILLISECONDS,
+            entity_type=EntityCategory.DIAGNOSTIC,
+            device_class=SensorDeviceClass.DURATION,
+            state_class=SensorStateClass.MEASUREMENT,
+            display_precision=0,
+        ),
+        Sensor(
+            attr="login_count",
+            name="Login count",
+            icon="mdi:login",
+            unit=None,
+            entity_type=EntityCategory.DIAGNOSTIC,
+            state_class=SensorStateClass.TOTAL_INCREASING,
+        ),
+    ]
+
+
+def _plan_keys(plans: tuple[str, ...]) -> dict[str, str]:
+    """Return a unique slug of every plan name.
+
+    Different names may have the same slug, e.g. "Data+ 5GB" and "Data 5GB",
+    later ones are numbered in the order of the response.
+    """
+    keys: dict[str, str] = {}
+    taken: set[str] = set()
+    for plan in plans:
+        slug = key = slugify(plan)
+        count = 1
+        while key in taken:
+            count += 1
+            key = f"{slug}_{count}"
+        taken.add(key)
+        keys[plan] = key
+    return keys
+
+
+def create_plan_entities(contract: MeinVodafoneContract) -> list[PlanSensor]:
+    """Return list of the per plan entities of the contract's plans."""
+    entities: list[PlanSensor] = []
+    plan_keys = {
+        container: _plan_keys(plans) for container, plans in contract.plan_names.items()
+    }
+    for template in create_entities():
+        container, _, metric = template.attr.partition("_")
+        if metric not in USAGE_METRICS:
+            continue
+        entities.extend(
+            PlanSensor(template, container, metric, plan, key)
+            for plan, key in plan_keys.get(container, {}).items()
+        )
+    return entities
+
+
 class MeinVodafoneEntities:
     """Class for accessing the entities."""
 
@@ -208,6 +341,6 @@ class MeinVodafoneEntities:
         """Initialize instruments."""
         self.entities_list: list[Sensor] = []
 
-        for entity in create_entities():
+        for entity in (*create_entities(), *create_plan_entities(contract)):
             if entity.setup(contract):
                 self.entities_list.append(entity)
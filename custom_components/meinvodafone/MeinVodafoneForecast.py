@@ -0,0 +1,114 @@
+"""Usage forecast of MeinVodafone contracts."""
+
+from __future__ import annotations
+
+from collections import deque
+from collections.abc import Iterable
+import math
+
+# Samples of the last days are used for the trend
+FORECAST_WINDOW = 7 * 86400  # seconds
+
+DAY = 86400  # seconds
+
+
+class UsageForecast:
+    """Linear trend of a running usage total within the billing cycle.
+
+    The least squares fit is kept as running sums, which are updated in
+    constant time when a sample enters or leaves the window, so the fit is
+    never recomputed from all samples. Times are stored in days since the
+    first sample of the cycle to keep the sums precise.
+    """
+
+    __slots__ = ("_origin", "_samples", "_st", "_stt", "_sty", "_sy", "window")
+
+    def __init__(self, window: float = FORECAST_WINDOW) -> None:
+        """Initialize an empty forecast."""
+        self.window = window
+        self._samples: deque[tuple[float, float]] = deque()
+        self._origin: float | None = None
+        self._st = self._sy = self._stt = self._sty = 0.0
+
+    def reset(self) -> None:
+        """Forget all samples, e.g. when a new billing cycle starts."""
+        self._samples.clear()
+        self._origin = None
+        self._st = self._sy = self._stt = self._sty = 0.0
+
+    def rebuild(self, samples: Iterable[tuple[float, float]]) -> None:
+        """Fill the forecast from (timestamp, value) samples, oldest first."""
+        self.reset()
+        for timestamp, value in samples:
+            self.add(timestamp, value)
+
+    def add(self, timestamp: float, value: float) -> None:
+        """Add a sample of the running total."""
+        if math.isnan(value):
+            return
+
+        if self._samples:
+            last_time, last_value = self._samples[-1]
+            if timestamp <= last_time:
+                return
+            if value < last_value:
+                # The total dropped, a new billing cycle started
+                self.reset()
+
+        if self._origin is None:
+            self._origin = timestamp
+
+        day = (timestamp - self._origin) / DAY
+        self._samples.append((day, value))
+        self._st += day
+        self._sy += value
+        self._stt += day * day
+        self._sty += day * value
+
+        # Drop the samples which left the window
+        while self._samples and self._samples[0][0] < day - self.window / DAY:
+            old_day, old_value = self._samples.popleft()
+            self._st -= old_day
+            self._sy -= old_value
+            self._stt -= old_day * old_day
+            self._sty -= old_day * old_value
+
+    def _fit(self) -> tuple[float, float] | None:
+        """Return slope per day and intercept of the trend."""
+        count = len(self._samples)
+        if count < 2:
+            return None
+        denominator = count * self._stt - self._st * self._st
+        if denominator <= 0:
+            return None
+        slope = (count * self._sty - self._st * self._sy) / denominator
+        intercept = (self._sy - slope * self._st) / count
+        return slope, intercept
+
+    @property
+    def daily_rate(self) -> float | None:
+        """Return the usage per day, None without a trend."""
+        fit = self._fit()
+        return None if fit is None else max(fit[0], 0.0)
+
+    def project(self, timestamp: float) -> float | None:
+        """Return the expected total at a time."""
+        fit = self._fit()
+        if fit is None or self._origin is None:
+            return None
+        slope, intercept = fit
+        projected = intercept + max(slope, 0.0) * (timestamp - self._origin) / DAY
+        # The total never decreases within the cycle
+        return max(projected, self._samples[-1][1])
+
+    def exhaustion(self, limit: float) -> float | None:
+        """Return the time the total is expected to reach a limit."""
+        fit = self._fit()
+        if fit is None or self._origin is None:
+            return None
+        slope, intercept = fit
+        if self._samples[-1][1] >= limit:
+            return self._origin + self._samples[-1][0] * DAY
+        if slope <= 0:
+            return None
+        return self._origin + (limit - intercept) / slope * DAY
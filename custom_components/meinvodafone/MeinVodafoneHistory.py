@@ -0,0 +1,176 @@
+"""Compact usage history of MeinVodafone contracts."""
+
+from __future__ import annotations
+
+from array import array
+from collections.abc import Iterator
+import math
+from typing import TYPE_CHECKING, Any
+
+if TYPE_CHECKING:
+    from .MeinVodafoneContract import MeinVodafoneContract
+
+# Columns of a sample, every column is a contiguous array of doubles
+COLUMNS = ("timestamp", "data_used", "minutes_used", "sms_used", "billing")
+
+# Samples kept per contract, about 20 kB of memory
+HISTORY_CAPACITY = 512
+# Samples are kept as fetched for a day, then one per hour for a week and
+# one per day beyond that
+RAW_RETENTION = 86400  # seconds
+HOURLY_RETENTION = 7 * 86400  # seconds
+
+Sample = tuple[float, float, float, float, float]
+
+
+def _number(value: str | int | float | None) -> float:
+    """Return a value as float, NaN when it is missing."""
+    if value is None:
+        return math.nan
+    try:
+        return float(value)
+    except (TypeError, ValueError):
+        return math.nan
+
+
+class UsageHistory:
+    """Fixed capacity ring buffer of usage samples of a contract.
+
+    Samples are stored column wise in preallocated arrays. When the buffer
+    is full, older samples are downsampled to hourly and daily resolution,
+    and only when that does not free any space the oldest sample is dropped.
+    The usage values are running totals of the billing cycle, so the last
+    sample of an hour or day represents it.
+    """
+
+    __slots__ = ("_columns", "_size", "_start", "capacity")
+
+    def __init__(self, capacity: int = HISTORY_CAPACITY) -> None:
+        """Initialize an empty history."""
+        self.capacity = capacity
+        self._columns = [array("d", bytes(8 * capacity)) for _ in COLUMNS]
+        self._start = 0
+        self._size = 0
+
+    def __len__(self) -> int:
+        """Return the number of samples."""
+        return self._size
+
+    @property
+    def last_timestamp(self) -> float | None:
+        """Return the timestamp of the newest sample."""
+        if not self._size:
+            return None
+        return self._columns[0][(self._start + self._size - 1) % self.capacity]
+
+    def record(self, contract: MeinVodafoneContract, timestamp: float) -> bool:
+        """Add the usage of a contract at the given server timestamp."""
+        return self.append(
+            (
+                timestamp,
+                _number(contract.data_used),
+                _number(contract.minutes_used),
+                _number(contract.sms_used),
+                _number(contract.billing_current_summary),
+            )
+        )
+
+    def append(self, sample: Sample) -> bool:
+        """Add a sample.
+
+        A sample with the timestamp of the newest one replaces it, older
+        samples are ignored.
+
+        Returns:
+            True if the history changed
+        """
+        last_timestamp = self.last_timestamp
+        if last_timestamp is not None:
+            if sample[0] < last_timestamp:
+                return False
+            if sample[0] == last_timestamp:
+                self._write((self._start + self._size - 1) % self.capacity, sample)
+                return True
+
+        if self._size == self.capacity:
+            self.compact(sample[0])
+        if self._size == self.capacity:
+            # Nothing to downsample, overwrite the oldest sample
+            self._start = (self._start + 1) % self.capacity
+            self._size -= 1
+
+        self._write((self._start + self._size) % self.capacity, sample)
+        self._size += 1
+        return True
+
+    def samples(self, since: float | None = None) -> Iterator[Sample]:
+        """Iterate over the samples from the oldest to the newest."""
+        columns = self._columns
+        for offset in range(self._size):
+            index = (self._start + offset) % self.capacity
+            if since is not None and columns[0][index] < since:
+                continue
+            yield (
+                columns[0][index],
+                columns[1][index],
+                columns[2][index],
+                columns[3][index],
+                columns[4][index],
+            )
+
+    def column(self, name: str) -> list[float]:
+        """Return the values of a column from the oldest to the newest."""
+        column = self._columns[COLUMNS.index(name)]
+        return [
+            column[(self._start + offset) % self.capacity]
+            for offset in range(self._size)
+        ]
+
+    def compact(self, now: float) -> None:
+        """Downsample old samples to hourly and daily resolution."""
+        kept: list[Sample] = []
+        last_bucket: tuple[int, int] | None = None
+        for sample in self.samples():
+            age = now - sample[0]
+            if age <= RAW_RETENTION:
+                bucket = None
+            elif age <= HOURLY_RETENTION:
+                bucket = (3600, int(sample[0] // 3600))
+            else:
+                bucket = (86400, int(sample[0] // 86400))
+
+            if bucket is not None and bucket == last_bucket:
+                # Keep the last sample of the bucket
+                kept[-1] = sample
+            else:
+                kept.append(sample)
+            last_bucket = bucket
+
+        self._start = 0
+        self._size = len(kept)
+        for index, sample in enumerate(kept):
+            self._write(index, sample)
+
+    def as_dict(self) -> dict[str, list[float | None]]:
+        """Return the history in a JSON serializable form."""
+        return {
+            name: [None if math.isnan(value) else value for value in self.column(name)]
+            for name in COLUMNS
+        }
+
+    @classmethod
+    def from_dict(
+        cls, data: dict[str, Any] | None, capacity: int = HISTORY_CAPACITY
+    ) -> UsageHistory:
+        """Restore a history stored by as_dict."""
+        history = cls(capacity)
+        if not data:
+            return history
+        for sample in zip(*(data.get(name, []) for name in COLUMNS)):
+            history.append(tuple(_number(value) for value in sample))
+        return history
+
+    def _write(self, index: int, sample: Sample) -> None:
+        """Write a sample into a slot of the arrays."""
+        for column, value in zip(self._columns, sample):
+            column[index] = value
@@ -0,0 +1,152 @@
+"""Timing instrumentation for MeinVodafone integration."""
+
+from __future__ import annotations
+
+from collections import deque
+from collections.abc import Iterator
+from contextlib import contextmanager
+import datetime
+import hashlib
+import time
+from typing import Any
+
+# Phases of a refresh, from waiting for the login to updating the entities
+PHASE_QUEUE = "queue"
+PHASE_LOGIN_LOCK = "login_lock"
+PHASE_LOGIN_DELAY = "login_delay"
+PHASE_LOGIN = "login"
+PHASE_HTTP = "http"
+PHASE_JSON_DECODE = "json_decode"
+PHASE_PARSE = "parse"
+PHASE_FETCH = "fetch"
+PHASE_CYCLE = "cycle"
+PHASE_ENTITY_UPDATE = "entity_update"
+
+# Endpoints recorded in the request trace
+ENDPOINT_LOGIN = "session/start"
+ENDPOINT_HASHING = "hashing"
+ENDPOINT_USAGE = "unbilledUsage"
+
+# Number of samples kept per phase
+HISTOGRAM_SIZE = 100
+# Number of requests kept in the trace
+TRACE_SIZE = 50
+
+
+class RollingHistogram:
+    """Duration samples of a phase, only the latest ones are kept."""
+
+    __slots__ = ("count", "samples")
+
+    def __init__(self, size: int = HISTOGRAM_SIZE) -> None:
+        """Initialize an empty histogram."""
+        self.samples: deque[float] = deque(maxlen=size)
+        self.count = 0
+
+    def add(self, seconds: float) -> None:
+        """Add a sample."""
+        self.samples.append(seconds)
+        self.count += 1
+
+    def summary(self) -> dict[str, Any]:
+        """Return the percentiles of the kept samples in milliseconds."""
+        if not self.samples:
+            return {"count": self.count}
+
+        ordered = sorted(self.samples)
+
+        def percentile(share: float) -> float:
+            index = min(len(ordered) - 1, int(share * len(ordered)))
+            return round(ordered[index] * 1000, 1)
+
+        return {
+            "count": self.count,
+            "last": round(self.samples[-1] * 1000, 1),
+            "min": round(ordered[0] * 1000, 1),
+            "p50": percentile(0.5),
+            "p90": percentile(0.9),
+            "p99": percentile(0.99),
+            "max": round(ordered[-1] * 1000, 1),
+        }
+
+
+class AccountMetrics:
+    """Phase timings and counters of one MeinVodafone login."""
+
+    def __init__(
+        self, size: int = HISTOGRAM_SIZE, trace_size: int = TRACE_SIZE
+    ) -> None:
+        """Initialize the metrics."""
+        self.size = size
+        self.phases: dict[str, RollingHistogram] = {}
+        self.logins = 0
+        # Usage fetches which joined a running fetch of the same contract
+        self.coalesced = 0
+        # Seconds the latest fetch of every contract took, including retries
+        self.last_fetch_latency: dict[str, float] = {}
+        # (timestamp, endpoint, status, seconds, bytes, body digest) of the
+        # latest requests, always on at a fixed memory cost
+        self.requests: deque[tuple[float, str, int | None, float, int, str | None]] = (
+            deque(maxlen=trace_size)
+        )
+
+    def record(self, phase: str, seconds: float) -> None:
+        """Record the duration of a phase."""
+        if phase not in self.phases:
+            self.phases[phase] = RollingHistogram(self.size)
+        self.phases[phase].add(seconds)
+
+    @contextmanager
+    def measure(self, phase: str) -> Iterator[None]:
+        """Record the duration of the enclosed block."""
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.record(phase, time.perf_counter() - start)
+
+    def trace(
+        self, endpoint: str, status: int | None, seconds: float, body: bytes | None
+    ) -> None:
+        """Record a request in the trace.
+
+        Only a digest of the body is kept, it shows whether responses changed
+        without storing any account data.
+        """
+        self.requests.append(
+            (
+                time.time(),
+                endpoint,
+                status,
+                seconds,
+                len(body) if body else 0,
+                hashlib.sha256(body).hexdigest()[:16] if body else None,
+            )
+        )
+
+    def as_dict(self) -> dict[str, Any]:
+        """Return the metrics for diagnostics."""
+        return {
+            "logins": self.logins,
+            "coalesced": self.coalesced,
+            "last_fetch_latency_ms": {
+                contract_id: round(seconds * 1000, 1)
+                for contract_id, seconds in self.last_fetch_latency.items()
+            },
+            "phases_ms": {
+                phase: histogram.summary() for phase, histogram in self.phases.items()
+            },
+            "requests": [
+                {
+                    "time": datetime.datetime.fromtimestamp(
+                        timestamp, datetime.timezone.utc
+                    ).isoformat(),
+                    "endpoint": endpoint,
+                    "status": status,
+                    "latency_ms": round(seconds * 1000, 1),
+                    "bytes": size,
+                    "digest": digest,
+                }
+                for timestamp, endpoint, status, seconds, size, digest in self.requests
+            ],
+        }
@@ -0,0 +1,215 @@
+"""Parser for the MeinVodafone unbilledUsage response."""
+
+from __future__ import annotations
+
+from collections.abc import Callable
+import logging
+from typing import Any
+
+from .const import (
+    BILLING,
+    CURRENT_SUMMARY,
+    CYCLE_END,
+    CYCLE_START,
+    DATA,
+    LAST_SUMMARY,
+    LAST_UPDATE,
+    MINUTES,
+    NAME,
+    REMAINING,
+    SMS,
+    TOTAL,
+    USED,
+)
+
+_LOGGER = logging.getLogger(__name__)
+
+# A path into the response, strings are dict keys and ints are list indexes
+Path = tuple[str | int, ...]
+Getter = Callable[[Any], Any]
+
+DEFAULT_UNIT = "MB"
+
+# Output slots of the parsed usage data
+USAGE_SLOTS = (MINUTES, SMS, DATA)
+
+# Usage group container (lower case) -> output slot
+CONTAINER_MAPPING: dict[str, str] = {
+    "minuten": MINUTES,
+    "sms": SMS,
+    "daten": DATA,
+    "d_eu_data": DATA,
+    "d_eu_flat_allnet_units": MINUTES,
+    "d_int_units": SMS,
+}
+
+# Billing field -> path below serviceUsageVBO.billDetails
+BILLING_FIELDS: dict[str, Path] = {
+    CURRENT_SUMMARY: ("currentSummary", "amount"),
+    LAST_SUMMARY: ("lastSummary", "amount"),
+    CYCLE_START: ("billCycleStartDate",),
+    CYCLE_END: ("billCycleEndDate",),
+}
+
+# Usage field -> path below a usage group with vluxgateAgg aggregation
+AGGREGATE_FIELDS: dict[str, Path] = {
+    NAME: ("vluxgateAgg", "name"),
+    REMAINING: ("vluxgateAgg", "aggregateRemaining"),
+    USED: ("vluxgateAgg", "aggregateUsed"),
+    TOTAL: ("vluxgateAgg", "aggregateTotal"),
+    LAST_UPDATE: ("usage", 0, "lastUpdateDate"),
+}
+AGGREGATE_UNIT: Path = ("usage", 0, "unitOfMeasure")
+
+# Usage field -> path below a single usage item
+ITEM_FIELDS: dict[str, Path] = {
+    NAME: ("name",),
+    REMAINING: ("remaining",),
+    USED: ("used",),
+    TOTAL: ("total",),
+    LAST_UPDATE: ("lastUpdateDate",),
+}
+ITEM_UNIT: Path = ("unitOfMeasure",)
+
+# Fields checked for glitched values before an item is accepted
+VALIDATED_FIELDS = (REMAINING, USED, TOTAL)
+
+
+def _compile_path(path: Path) -> Getter:
+    """Compile a path into a getter returning None for missing values."""
+    if len(path) == 1 and isinstance(path[0], str):
+        key = path[0]
+        return lambda source: source.get(key)
+
+    def getter(source: Any) -> Any:
+        value = source
+        for step in path:
+            if isinstance(step, int):
+                value = (
+                    value[step]
+                    if isinstance(value, list) and len(value) > step
+                    else None
+                )
+            else:
+                value = value.get(step) if isinstance(value, dict) else None
+            if value is None:
+                return None
+        return value
+
+    return getter
+
+
+def _compile_fields(fields: dict[str, Path]) -> Callable[[Any], dict[str, Any]]:
+    """Compile an extraction table into a function building the output record."""
+    getters = [(key, _compile_path(path)) for key, path in fields.items()]
+
+    def extract(source: Any) -> dict[str, Any]:
+        return {key: getter(source) for key, getter in getters}
+
+    return extract
+
+
+# Extraction tables are compiled once at import time
+_extract_billing = _compile_fields(BILLING_FIELDS)
+_extract_aggregate = _compile_fields(AGGREGATE_FIELDS)
+_extract_item = _compile_fields(ITEM_FIELDS)
+_aggregate_unit = _compile_path(AGGREGATE_UNIT)
+_item_unit = _compile_path(ITEM_UNIT)
+
+
+def parse_unbilled_usage(response_data: dict[str, Any]) -> dict[str, Any]:
+    """Parse the unbilledUsage response into the contract usage data.
+
+    Args:
+        response_data: The decoded JSON response
+
+    Returns:
+        Billing details and the usage items of every output slot
+    """
+    contract_usage_data: dict[str, Any] = {
+        BILLING: {},
+        **{slot: [] for slot in USAGE_SLOTS},
+    }
+
+    service_usage_vbo = response_data.get("serviceUsageVBO", {})
+
+    billing_details = service_usage_vbo.get("billDetails")
+    if billing_details:
+        contract_usage_data[BILLING] = _extract_billing(billing_details)
+    else:
+        _LOGGER.debug("No billing details found, skipping.")
+
+    for account in service_usage_vbo.get("usageAccounts", []):
+        for usage_group in account.get("usageGroup", []):
+            slot = CONTAINER_MAPPING.get(usage_group.get("container", "").lower())
+            if slot:
+                contract_usage_data[slot].extend(_parse_usage_group(usage_group))
+
+    return contract_usage_data
+
+
+def _parse_usage_group(usage_group: dict[str, Any]) -> list[dict[str, Any]]:
+    """Return the validated usage items of a usage group."""
+    if usage_group.get("vluxgateAgg"):
+        # Handle aggregated usage data
+        data = _extract_aggregate(usage_group)
+        if not validate_usage_values(data, _aggregate_unit(usage_group)):
+            _LOGGER.debug("Skipping aggregated values with suspicious data")
+            return []
+        return [data]
+
+    # Handle individual usage items
+    items = []
+    for usage_item in usage_group.get("usage", []):
+        data = _extract_item(usage_item)
+        if not validate_usage_values(data, _item_unit(usage_item)):
+            _LOGGER.debug("Skipping usage item with suspicious values: %s", data[NAME])
+            continue
+        items.append(data)
+    return items
+
+
+def validate_usage_values(data: dict[str, Any], unit: str | None) -> bool:
+    """Validate remaining, used, and total usage values.
+
+    Args:
+        data: The usage item
+        unit: The unit of measure
+
+    Returns:
+        True if all values are valid, False otherwise
+    """
+    unit = unit or DEFAULT_UNIT
+    return all(is_valid_data_value(data[key], unit) for key in VALIDATED_FIELDS)
+
+
+def is_valid_data_value(value: str | int | None, unit: str) -> bool:
+    """Validate data values to detect incorrect/glitched values.
+
+    Args:
+        value: The numeric value as string or int
+        unit: The reported unit of measure
+
+    Returns:
+        True if value seems valid, False if suspicious
+    """
+    if value is None:
+        return True  # None is acceptable
+
+    try:
+        numeric_value = int(value)
+
+        # Flag suspicious values: if reported as MB but > 500000 (~500GB)
+        # it's likely a server glitch reporting KB as MB
+        if unit == "MB" and numeric_value > 500000:
+            _LOGGER.warning(
+                "Ignoring suspicious data value: %s %s (likely server glitch)",
+                numeric_value,
+                unit,
+            )
+            return False
+
+        return True
+    except (ValueError, TypeError):
+        _LOGGER.warning("Invalid data value format: %s", value)
+        return False
@@ -0,0 +1,248 @@
+"""Adaptive polling scheduler for MeinVodafone contracts."""
+
+from __future__ import annotations
+
+import datetime
+import hashlib
+import logging
+from typing import Any
+
+from .const import (
+    BILLING,
+    CYCLE_END,
+    DATA,
+    LAST_UPDATE,
+    MINUTES,
+    REMAINING,
+    SMS,
+    TOTAL,
+    USED,
+)
+
+_LOGGER = logging.getLogger(__name__)
+
+# Growth factor of the interval for every poll without new server data
+BACKOFF_FACTOR = 1.5
+# Weight of the newest observation in the moving averages
+SMOOTHING = 0.3
+# Poll at least this many times before the data quota is expected to run out
+EXHAUSTION_POLLS = 4
+# Delay after the expected server update or cycle change before polling
+POLL_MARGIN = 60  # seconds
+
+
+def phase_offset(key: str, period: float) -> float:
+    """Return a deterministic offset of a key within a period.
+
+    A stable hash is used (instead of the salted builtin hash) so the offset
+    survives restarts and keys are spread evenly over the period.
+    """
+    digest = hashlib.sha256(key.encode()).digest()
+    return int.from_bytes(digest[:8], "big") % int(period * 1000) / 1000
+
+
+def latest_server_update(usage_data: dict[str, Any]) -> float | None:
+    """Return the latest lastUpdateDate of all usage items as timestamp."""
+    latest = max(
+        (
+            item[LAST_UPDATE]
+            for container in (MINUTES, SMS, DATA)
+            for item in usage_data.get(container, [])
+            if item.get(LAST_UPDATE)
+        ),
+        default=None,
+    )
+    if latest is None:
+        return None
+    try:
+        return datetime.datetime.fromisoformat(latest).timestamp()
+    except (ValueError, TypeError):
+        return None
+
+
+def data_sum(usage_data: dict[str, Any], key: str) -> int | None:
+    """Return the sum of a data usage value over all plans."""
+    values = [
+        int(item[key]) for item in usage_data.get(DATA, []) if item.get(key) is not None
+    ]
+    return sum(values) if values else None
+
+
+def _cycle_change(usage_data: dict[str, Any]) -> float | None:
+    """Return the timestamp when the next billing cycle starts."""
+    cycle_end = usage_data.get(BILLING, {}).get(CYCLE_END)
+    if not cycle_end:
+        return None
+    try:
+        end = datetime.date.fromisoformat(cycle_end) + datetime.timedelta(days=1)
+    except (ValueError, TypeError):
+        return None
+    return datetime.datetime.combine(
+        end, datetime.time(), tzinfo=datetime.timezone.utc
+    ).timestamp()
+
+
+class ContractSchedule:
+    """Polling state of a single contract."""
+
+    __slots__ = (
+        "consumption_rate",
+        "data_used",
+        "next_poll",
+        "server_cadence",
+        "server_update",
+        "server_update_seen",
+        "unchanged_polls",
+    )
+
+    def __init__(self, now: float) -> None:
+        """Initialize a contract which is due immediately."""
+        self.next_poll: float = now
+        # Latest server lastUpdateDate and the local time it was first seen
+        self.server_update: float | None = None
+        self.server_update_seen: float | None = None
+        # Average seconds between server updates
+        self.server_cadence: float | None = None
+        self.unchanged_polls = 0
+        # Used data at the latest server update and average MB per second
+        self.data_used: int | None = None
+        self.consumption_rate: float | None = None
+
+
+class MeinVodafoneScheduler:
+    """Work out the next poll of every contract from its observed data.
+
+    Contracts are polled shortly after the server is expected to publish
+    new data, back off while nothing changes, and poll more often when
+    the data quota is about to run out or the billing cycle changes.
+    """
+
+    def __init__(
+        self,
+        default_interval: float,
+        min_interval: float,
+        max_interval: float,
+    ) -> None:
+        """Initialize the scheduler, intervals are in seconds."""
+        self.default_interval = default_interval
+        self.min_interval = min_interval
+        self.max_interval = max_interval
+        self._schedules: dict[str, ContractSchedule] = {}
+
+    def remove(self, contract_id: str) -> None:
+        """Forget a contract."""
+        self._schedules.pop(contract_id, None)
+
+    def next_poll(self, contract_id: str) -> float | None:
+        """Return the timestamp of the next poll of a contract."""
+        if schedule := self._schedules.get(contract_id):
+            return schedule.next_poll
+        return None
+
+    def due_contracts(self, contract_ids: list[str], now: float) -> list[str]:
+        """Return the contracts to poll now.
+
+        Contracts which become due within half the minimum interval are
+        pulled forward, so they are fetched in the same burst.
+        """
+        horizon = now + self.min_interval / 2
+        return [
+            contract_id
+            for contract_id in contract_ids
+            if self._schedule(contract_id, now).next_poll <= horizon
+        ]
+
+    def next_interval(self, contract_ids: list[str], now: float) -> float:
+        """Return the seconds until the next contract becomes due."""
+        if not contract_ids:
+            return self.default_interval
+        next_poll = min(self._schedule(cid, now).next_poll for cid in contract_ids)
+        return max(self.min_interval, next_poll - now)
+
+    def defer(self, contract_id: str, next_poll: float, now: float) -> None:
+        """Set the first poll of a contract which already has cached data."""
+        self._schedule(contract_id, now).next_poll = next_poll
+
+    def failed(self, contract_id: str, now: float) -> None:
+        """Retry a failed contract after the default interval."""
+        self._schedule(contract_id, now).next_poll = now + self.default_interval
+
+    def observe(self, contract_id: str, usage_data: dict[str, Any], now: float) -> None:
+        """Record fetched usage data and schedule the next poll."""
+        schedule = self._schedule(contract_id, now)
+        server_update = latest_server_update(usage_data)
+        data_used = data_sum(usage_data, USED)
+
+        if server_update is not None and server_update != schedule.server_update:
+            if schedule.server_update is not None:
+                gap = server_update - schedule.server_update
+                if gap > 0:
+                    schedule.server_cadence = self._smooth(schedule.server_cadence, gap)
+                    if data_used is not None and schedule.data_used is not None:
+                        consumed = data_used - schedule.data_used
+                        # A negative value means a new billing cycle started
+                        if consumed >= 0:
+                            schedule.consumption_rate = self._smooth(
+                                schedule.consumption_rate, consumed / gap
+                            )
+            schedule.server_update = server_update
+            schedule.server_update_seen = now
+            schedule.data_used = data_used
+            schedule.unchanged_polls = 0
+        else:
+            schedule.unchanged_polls += 1
+
+        interval = self._interval(schedule, usage_data, now)
+        schedule.next_poll = now + interval
+        _LOGGER.debug(
+            "Next poll of %s in %.0f seconds (cadence %s, rate %s)",
+            contract_id,
+            interval,
+            schedule.server_cadence,
+            schedule.consumption_rate,
+        )
+
+    def _interval(
+        self, schedule: ContractSchedule, usage_data: dict[str, Any], now: float
+    ) -> float:
+        """Return the seconds until the next poll of a contract."""
+        backoff = self.default_interval * BACKOFF_FACTOR**schedule.unchanged_polls
+        interval = backoff
+
+        if schedule.server_cadence and schedule.server_update_seen is not None:
+            # Poll shortly after the server is expected to publish new data
+            expected = schedule.server_update_seen + schedule.server_cadence
+            if expected - now >= self.min_interval:
+                interval = expected - now + POLL_MARGIN
+
+        remaining = data_sum(usage_data, REMAINING)
+        # Poll more often when the data quota is about to run out, flat
+        # tariffs (a total of 0) and exhausted quotas cannot run out any further
+        if (
+            schedule.consumption_rate
+            and remaining is not None
+            and remaining > 0
+            and data_sum(usage_data, TOTAL)
+        ):
+            exhaustion = remaining / schedule.consumption_rate
+            interval = min(interval, exhaustion / EXHAUSTION_POLLS)
+
+        cycle_change = _cycle_change(usage_data)
+        if cycle_change is not None and now < cycle_change < now + interval:
+            # Pick up the new billing cycle as soon as it starts
+            interval = cycle_change - now + POLL_MARGIN
+
+        return min(self.max_interval, max(self.min_interval, interval))
+
+    def _schedule(self, contract_id: str, now: float) -> ContractSchedule:
+        """Return the schedule of a contract, new contracts are due now."""
+        if contract_id not in self._schedules:
+            self._schedules[contract_id] = ContractSchedule(now)
+        return self._schedules[contract_id]
+
+    @staticmethod
+    def _smooth(average: float | None, value: float) -> float:
+        """Return the exponential moving average including a new value."""
+        if average is None:
+            return value
+        return average + SMOOTHING * (value - average)
@@ -0,0 +1,150 @@
+"""Long-term statistics import for MeinVodafone integration."""
+
+from __future__ import annotations
+
+import asyncio
+import logging
+import math
+import time
+from typing import Any
+
+from homeassistant.components.recorder import get_instance
+from homeassistant.components.recorder.models import (
+    StatisticData,
+    StatisticMeanType,
+    StatisticMetaData,
+)
+from homeassistant.components.recorder.statistics import (
+    async_add_external_statistics,
+    get_last_statistics,
+)
+from homeassistant.components.sensor.const import UnitOfInformation, UnitOfTime
+from homeassistant.const import CURRENCY_EURO
+from homeassistant.core import HomeAssistant
+from homeassistant.util import dt as dt_util, slugify
+
+from .const import DOMAIN
+from .MeinVodafoneHistory import COLUMNS, UsageHistory
+
+_LOGGER = logging.getLogger(__name__)
+
+HOUR = 3600  # seconds
+
+# History column -> unit of the statistic
+STATISTIC_UNITS: dict[str, str] = {
+    "data_used": UnitOfInformation.MEBIBYTES,
+    "minutes_used": UnitOfTime.MINUTES,
+    "sms_used": "sms",
+    "billing": CURRENCY_EURO,
+}
+
+
+class StatisticsImporter:
+    """Import the usage history of a contract into external statistics.
+
+    Every finished hour with samples becomes one row at the hour of the
+    server's lastUpdateDate, not of the poll. The usage values are running
+    totals of the billing cycle, the row sum keeps growing across cycles.
+    Rows are imported from the last row in the database on, so hours which
+    were not imported before a restart are filled in.
+    """
+
+    def __init__(self, hass: HomeAssistant, contract_id: str) -> None:
+        """Initialize the importer."""
+        self.hass = hass
+        object_id = slugify(contract_id)
+        self._metadata: dict[str, StatisticMetaData] = {
+            column: StatisticMetaData(
+                mean_type=StatisticMeanType.NONE,
+                has_sum=True,
+                name=f"{contract_id} {column.replace('_', ' ')}",
+                source=DOMAIN,
+                statistic_id=f"{DOMAIN}:{object_id}_{column}",
+                unit_of_measurement=unit,
+            )
+            for column, unit in STATISTIC_UNITS.items()
+        }
+        # Column -> (start, state, sum) of the last imported row
+        self._last_rows: dict[str, tuple[float, float, float]] | None = None
+        # Start of the hour of the last import, later hours are pending
+        self._imported_hour = 0.0
+        self._lock = asyncio.Lock()
+
+    @property
+    def has_pending_hours(self) -> bool:
+        """Return true if an hour finished since the last import."""
+        return time.time() // HOUR * HOUR > self._imported_hour
+
+    async def async_import(self, history: UsageHistory) -> None:
+        """Import all finished hours which are not imported yet."""
+        if self._lock.locked():
+            # The running import picks up the new samples as well
+            return
+
+        async with self._lock:
+            if self._last_rows is None:
+                self._last_rows = await self._async_load_last_rows()
+
+            current_hour = time.time() // HOUR * HOUR
+            self._imported_hour = current_hour
+            for column, metadata in self._metadata.items():
+                rows = self._rows(history, column, current_hour)
+                if rows:
+                    _LOGGER.debug(
+                        "Importing %s hours of %s", len(rows), metadata["statistic_id"]
+                    )
+                    async_add_external_statistics(self.hass, metadata, rows)
+
+    async def _async_load_last_rows(self) -> dict[str, tuple[float, float, float]]:
+        """Load the last imported row of every statistic."""
+
+        def load() -> dict[str, list[dict[str, Any]]]:
+            return {
+                column: get_last_statistics(
+                    self.hass, 1, metadata["statistic_id"], True, {"state", "sum"}
+                ).get(metadata["statistic_id"], [])
+                for column, metadata in self._metadata.items()
+            }
+
+        loaded = await get_instance(self.hass).async_add_executor_job(load)
+        last_rows: dict[str, tuple[float, float, float]] = {}
+        for column, rows in loaded.items():
+            if rows:
+                row = rows[0]
+                last_rows[column] = (
+                    row["start"],
+                    row["state"] or 0.0,
+                    row["sum"] or 0.0,
+                )
+        return last_rows
+
+    def _rows(
+        self, history: UsageHistory, column: str, current_hour: float
+    ) -> list[StatisticData]:
+        """Return the rows of the finished hours after the last imported one."""
+        assert self._last_rows is not None
+        index = COLUMNS.index(column)
+        last_start, state, total = self._last_rows.get(column, (None, None, 0.0))
+
+        # Last value of every hour, the samples are ordered by time
+        hourly: dict[float, float] = {}
+        since = None if last_start is None else last_start + HOUR
+        for sample in history.samples(since):
+            hour = sample[0] // HOUR * HOUR
+            if hour >= current_hour or math.isnan(sample[index]):
+                continue
+            hourly[hour] = sample[index]
+
+        rows: list[StatisticData] = []
+        for hour, value in hourly.items():
+            if state is not None:
+                # A lower value means a new billing cycle started from 0
+                total += value - state if value >= state else value
+            state = value
+            rows.append(
+                StatisticData(
+                    start=dt_util.utc_from_timestamp(hour), state=value, sum=total
+                )
+            )
+            self._last_rows[column] = (hour, value, total)
+        return rows
@@ -2,33 +2,62 @@
 
 from __future__ import annotations
 
-import asyncio
 from datetime import timedelta
+import json
 import logging
+import math
+import time
+from typing import Any
 
 from homeassistant.config_entries import ConfigEntry
 from homeassistant.const import CONF_PASSWORD, CONF_USERNAME
-from homeassistant.core import HomeAssistant
+from homeassistant.core import CALLBACK_TYPE, HomeAssistant, callback
 from homeassistant.exceptions import ConfigEntryAuthFailed
+from homeassistant.helpers import config_validation as cv
+from homeassistant.helpers.storage import Store
+from homeassistant.helpers.typing import ConfigType
 from homeassistant.helpers.update_coordinator import DataUpdateCoordinator, UpdateFailed
+from homeassistant.util import dt as dt_util
 
+from .MeinVodafoneAccountCoordinator import MeinVodafoneAccountCoordinator
 from .MeinVodafoneAPIPool import MeinVodafoneAPIPool
 from .const import (
+    ACCOUNT_COORDINATORS,
     CONTRACT_ID,
     COORDINATOR,
     DATA_LISTENER,
     DEFAULT_UPDATE_INTERVAL,
     DOMAIN,
+    HTTP_CONNECTOR,
     MEINVODAFONE_API_POOL,
-    REQUEST_TIMEOUT,
+    SNAPSHOT_SAVE_DELAY,
+    STORAGE_VERSION,
+    USED,
 )
 from .MeinVodafoneContract import MeinVodafoneContract
 from .MeinVodafoneEntities import MeinVodafoneEntities
+from .MeinVodafoneForecast import UsageForecast
+from .MeinVodafoneHistory import UsageHistory
+from .MeinVodafoneMetrics import PHASE_ENTITY_UPDATE
+from .MeinVodafoneScheduler import data_sum, latest_server_update
+from .MeinVodafoneStatistics import StatisticsImporter
+from .services import async_setup_services
 
 _LOGGER = logging.getLogger(__name__)
 
 PLATFORMS: list[str] = ["sensor"]
 
+CONFIG_SCHEMA = cv.config_entry_only_config_schema(DOMAIN)
+
+# Keys in hass.data[DOMAIN] which are not config entries
+SHARED_DATA_KEYS = (MEINVODAFONE_API_POOL, ACCOUNT_COORDINATORS, HTTP_CONNECTOR)
+
+
+async def async_setup(hass: HomeAssistant, config: ConfigType) -> bool:
+    """Set up the MeinVodafone services."""
+    async_setup_services(hass)
+    return True
+
 
 async def async_setup_entry(hass: HomeAssistant, config_entry: ConfigEntry) -> bool:
     """Set up MeinVodafone from a config entry."""
@@ -37,13 +66,21 @@ async def async_setup_entry(hass: HomeAssistant, config_entry: ConfigEntry) -> b
 
     # Create API pool if it doesn't exist (shared across all entries)
     if MEINVODAFONE_API_POOL not in hass.data[DOMAIN]:
-        hass.data[DOMAIN][MEINVODAFONE_API_POOL] = MeinVodafoneAPIPool()
+        hass.data[DOMAIN][MEINVODAFONE_API_POOL] = MeinVodafoneAPIPool(hass)
+
+    # Restore saved sessions before the first account is created
+    await hass.data[DOMAIN][MEINVODAFONE_API_POOL].async_load_sessions()
 
-    update_interval = timedelta(minutes=DEFAULT_UPDATE_INTERVAL)
+    account_coordinator = _get_account_coordinator(hass, config_entry)
 
-    coordinator = MeinVodafoneCoordinator(hass, config_entry, update_interval)
+    coordinator = MeinVodafoneCoordinator(hass, config_entry, account_coordinator)
 
-    await coordinator.async_refresh()
+    if await coordinator.async_load_snapshot():
+        # Serve the cached snapshot right away and revalidate it in the
+        # account's staggered cycle instead of all entries at once
+        account_coordinator.async_defer_contract(coordinator.contract_id)
+    else:
+        await coordinator.async_refresh()
 
     hass.data[DOMAIN][config_entry.entry_id] = {
         COORDINATOR: coordinator,
@@ -62,26 +99,90 @@ async def async_unload_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
         if DATA_LISTENER in entry_data:
             entry_data[DATA_LISTENER]()
 
-        # Note: Don't close API session here - it might be used by other contracts
-        # The session will be closed when all entries for that username are removed
+        coordinator: MeinVodafoneCoordinator = entry_data[COORDINATOR]
+        await coordinator.async_shutdown()
+
+        # Close the account session once the last contract of the login is gone
+        account_coordinator = coordinator.account_coordinator
+        if account_coordinator.remove_contract(coordinator.contract_id):
+            await account_coordinator.async_shutdown()
+            hass.data[DOMAIN][ACCOUNT_COORDINATORS].pop(
+                account_coordinator.username, None
+            )
+            await hass.data[DOMAIN][MEINVODAFONE_API_POOL].remove(
+                account_coordinator.username
+            )
 
     # If this was the last entry, clean up the API pool
-    if (
-        not hass.data[DOMAIN]
-        or len([k for k in hass.data[DOMAIN] if k != MEINVODAFONE_API_POOL]) == 0
-    ):
+    if not [k for k in hass.data[DOMAIN] if k not in SHARED_DATA_KEYS]:
+        hass.data[DOMAIN].pop(ACCOUNT_COORDINATORS, None)
         if MEINVODAFONE_API_POOL in hass.data[DOMAIN]:
             await hass.data[DOMAIN][MEINVODAFONE_API_POOL].close_all()
             del hass.data[DOMAIN][MEINVODAFONE_API_POOL]
+        if connector := hass.data[DOMAIN].pop(HTTP_CONNECTOR, None):
+            await connector.close()
 
     return unload_ok
 
 
+async def async_remove_entry(hass: HomeAssistant, entry: ConfigEntry) -> None:
+    """Remove the cached usage snapshot and session of a deleted config entry."""
+    await _snapshot_store(hass, entry.entry_id).async_remove()
+
+    username = entry.data.get(CONF_USERNAME)
+    if not any(
+        other.data.get(CONF_USERNAME) == username
+        for other in hass.config_entries.async_entries(DOMAIN)
+        if other.entry_id != entry.entry_id
+    ):
+        await MeinVodafoneAPIPool.async_remove_saved_session(hass, username)
+
+
+def _snapshot_store(hass: HomeAssistant, entry_id: str) -> Store[dict[str, Any]]:
+    """Return the store holding the last usage snapshot of a config entry."""
+    return Store(hass, STORAGE_VERSION, f"{DOMAIN}.{entry_id}")
+
+
+def _get_account_coordinator(
+    hass: HomeAssistant, config_entry: ConfigEntry
+) -> MeinVodafoneAccountCoordinator:
+    """Get or create the coordinator shared by all contracts of a login."""
+    username = config_entry.data.get(CONF_USERNAME)
+    password = config_entry.data.get(CONF_PASSWORD)
+
+    if not username or not password:
+        raise ValueError("Username and password are required")
+
+    account_coordinators: dict[str, MeinVodafoneAccountCoordinator] = hass.data[
+        DOMAIN
+    ].setdefault(ACCOUNT_COORDINATORS, {})
+
+    if username not in account_coordinators:
+        account_coordinators[username] = MeinVodafoneAccountCoordinator(
+            hass,
+            hass.data[DOMAIN][MEINVODAFONE_API_POOL],
+            username,
+            password,
+            timedelta(minutes=DEFAULT_UPDATE_INTERVAL),
+        )
+
+    account_coordinator = account_coordinators[username]
+    account_coordinator.add_contract(config_entry.data.get(CONTRACT_ID), password)
+    return account_coordinator
+
+
 class MeinVodafoneCoordinator(DataUpdateCoordinator):
-    """Class to manage fetching MeinVodafone data."""
+    """Class to manage MeinVodafone data of a single contract.
+
+    Polling is owned by the account coordinator, this coordinator only
+    picks up the contract's share of every account cycle.
+    """
 
     def __init__(
-        self, hass: HomeAssistant, config_entry: ConfigEntry, update_interval: timedelta
+        self,
+        hass: HomeAssistant,
+        config_entry: ConfigEntry,
+        account_coordinator: MeinVodafoneAccountCoordinator,
     ) -> None:
         """Initialize."""
         self.config_entry = config_entry
@@ -89,77 +190,226 @@ class MeinVodafoneCoordinator(DataUpdateCoordinator):
         self.contract: MeinVodafoneContract | None = None
         self.usage_data: dict = {}
         self.entities_list: list = []
-        self.update_interval = update_interval
+        self.account_coordinator = account_coordinator
+        self.api = account_coordinator.api
+        self.metrics = account_coordinator.metrics
+        self.username = account_coordinator.username
+        self._account_result: dict[str, Any] | None = None
+        self._usage_fingerprint: int | None = None
+        self._store = _snapshot_store(hass, config_entry.entry_id)
+        self.history = UsageHistory()
+        self.forecast = UsageForecast()
+        self._statistics = StatisticsImporter(hass, self.contract_id)
+
+        # True while the contract is served from the cached snapshot
+        self.is_stale = False
+
+        # Number of entity state writes skipped because nothing changed
+        self.suppressed_writes = 0
+
+        # Listeners are only notified when a new contract was built
+        super().__init__(
+            hass, _LOGGER, name=DOMAIN, update_interval=None, always_update=False
+        )
+
+        self._unsub_account_listener: CALLBACK_TYPE | None = (
+            account_coordinator.async_add_listener(self._handle_account_update)
+        )
 
-        username = config_entry.data.get(CONF_USERNAME)
-        password = config_entry.data.get(CONF_PASSWORD)
+    async def async_shutdown(self) -> None:
+        """Detach from the account coordinator."""
+        await super().async_shutdown()
+        if self._unsub_account_listener:
+            self._unsub_account_listener()
+            self._unsub_account_listener = None
 
-        if not username or not password:
-            raise ValueError("Username and password are required")
+    async def async_load_snapshot(self) -> bool:
+        """Restore the contract from the last persisted snapshot.
 
-        # Get shared API instance from pool
-        api_pool: MeinVodafoneAPIPool = hass.data[DOMAIN][MEINVODAFONE_API_POOL]
-        self.api = api_pool.get_or_create(username, password)
-        self.username = username  # Store for potential cleanup
+        Returns:
+            True if a snapshot was found and the contract was restored
+        """
+        snapshot = await self._store.async_load()
+        if not snapshot or not snapshot.get("usage_data"):
+            return False
 
-        super().__init__(
-            hass, _LOGGER, name=DOMAIN, update_interval=self.update_interval
+        _LOGGER.debug(
+            "Restored usage snapshot for %s from %s",
+            self.contract_id,
+            snapshot.get("timestamp"),
+        )
+        self.history = UsageHistory.from_dict(snapshot.get("history"))
+        self.forecast.rebuild(
+            (timestamp, data_used)
+            for timestamp, data_used, *_ in self.history.samples()
         )
+        try:
+            self.data = self.update(snapshot["usage_data"])
+        except (TypeError, ValueError) as err:
+            _LOGGER.warning(
+                "Ignoring invalid snapshot of %s: %s", self.contract_id, err
+            )
+            return False
+        self._usage_fingerprint = self._fingerprint(snapshot["usage_data"])
+        self.is_stale = True
+        return True
 
     async def _async_update_data(self) -> MeinVodafoneContract | None:
         """Fetch data."""
         _LOGGER.debug("Starting data update for contract %s", self.contract_id)
         try:
-            # Get API pool reference
-            api_pool: MeinVodafoneAPIPool = self.hass.data[DOMAIN][
-                MEINVODAFONE_API_POOL
-            ]
-
-            # Ensure authenticated before fetching data
-            if not await api_pool.ensure_authenticated(self.api, self.username):
-                raise ConfigEntryAuthFailed(
-                    f"Authentication failed for {self.contract_id}"
-                )
-
-            async with asyncio.timeout(REQUEST_TIMEOUT):
-                data = await self.api.get_contract_usage(self.contract_id)
-                status_code = data.get("status_code")
-
-                if status_code == 401:  # Unauthorized
-                    _LOGGER.debug("Session expired, attempting re-login")
-
-                    # Mark as unauthenticated and try again
-                    self.api.is_authenticated = False
-                    if await api_pool.ensure_authenticated(self.api, self.username):
-                        data = await self.api.get_contract_usage(self.contract_id)
-                        if data.get("status_code") == 200:
-                            return await self.update(data.get("usage_data", {}))
-                    raise ConfigEntryAuthFailed(
-                        f"Authentication failed for {self.contract_id}"
-                    )
-                elif status_code != 200:
-                    raise UpdateFailed(f"Failed to fetch data: status {status_code}")
-
-                return await self.update(data.get("usage_data", {}))
-        except asyncio.TimeoutError as err:
-            raise UpdateFailed("Timeout fetching data") from err
-        except ConfigEntryAuthFailed:
-            raise  # Re-raise authentication errors without wrapping
+            await self.account_coordinator.async_refresh_contracts([self.contract_id])
+        except ConfigEntryAuthFailed as err:
+            raise ConfigEntryAuthFailed(
+                f"Authentication failed for {self.contract_id}"
+            ) from err
         except Exception as err:
             raise UpdateFailed(f"Error fetching data: {err}") from err
 
-    async def update(self, usage_data: dict) -> MeinVodafoneContract | None:
-        """Update usage data from MeinVodafone."""
+        return self._contract_from_account()
+
+    @callback
+    def _handle_account_update(self) -> None:
+        """Handle a finished account cycle."""
+        if not self.account_coordinator.last_update_success:
+            err = self.account_coordinator.last_exception
+            if isinstance(err, ConfigEntryAuthFailed):
+                self.config_entry.async_start_reauth(self.hass)
+            self.async_set_update_error(
+                err or UpdateFailed(f"Error fetching data for {self.contract_id}")
+            )
+            return
+
+        try:
+            contract = self._contract_from_account()
+        except UpdateFailed as err:
+            self.async_set_update_error(err)
+            return
+
+        if self._statistics.has_pending_hours:
+            # One batched import per finished hour instead of state rows
+            self.config_entry.async_create_background_task(
+                self.hass,
+                self._statistics.async_import(self.history),
+                f"{DOMAIN} statistics {self.contract_id}",
+            )
+
+        if contract is self.data and self.last_update_success:
+            # Payload is unchanged, skip the entity fan-out
+            return
+
+        with self.metrics.measure(PHASE_ENTITY_UPDATE):
+            self.async_set_updated_data(contract)
+
+    def _contract_from_account(self) -> MeinVodafoneContract | None:
+        """Build the contract from the last account cycle."""
+        result = (self.account_coordinator.data or {}).get(self.contract_id)
+
+        if result is None and self.is_stale and self.contract:
+            # Restored from the snapshot, its deferred first poll is pending
+            return self.contract
+        if result is None:
+            raise UpdateFailed(f"No data received for {self.contract_id}")
+
+        if result is self._account_result:
+            return self.contract
+
+        status_code = result.get("status_code")
+        if status_code is None:
+            raise UpdateFailed(f"Error fetching data: {result.get('error_message')}")
+        if status_code != 200:
+            raise UpdateFailed(f"Failed to fetch data: status {status_code}")
+
+        self._account_result = result
+        usage_data = result.get("usage_data", {})
+
+        fingerprint = self._fingerprint(usage_data)
+        if fingerprint == self._usage_fingerprint and not self.is_stale:
+            _LOGGER.debug("Usage data of %s is unchanged", self.contract_id)
+            return self.contract
+
+        try:
+            contract = self.update(
+                usage_data, latest_server_update(usage_data) or time.time()
+            )
+        except (TypeError, ValueError) as err:
+            # Build it again from the next result
+            self._account_result = None
+            raise UpdateFailed(
+                f"Invalid usage data of {self.contract_id}: {err}"
+            ) from err
+        self._usage_fingerprint = fingerprint
+        self._store.async_delay_save(self._snapshot_data, SNAPSHOT_SAVE_DELAY)
+        return contract
+
+    @staticmethod
+    def _fingerprint(usage_data: dict[str, Any]) -> int:
+        """Return a fingerprint of the normalized usage data.
+
+        The current date is part of the fingerprint, as the billing cycle
+        days are derived from it and must still be refreshed daily.
+        """
+        return hash(
+            (
+                json.dumps(usage_data, sort_keys=True),
+                dt_util.utcnow().date().toordinal(),
+            )
+        )
+
+    def _snapshot_data(self) -> dict[str, Any]:
+        """Return the snapshot to persist."""
+        return {
+            "timestamp": dt_util.utcnow().isoformat(),
+            "usage_data": self.usage_data,
+            "history": self.history.as_dict(),
+        }
+
+    def _reconcile_entities(self) -> None:
+        """Append the entities which became supported by the contract.
+
+        Entities are never removed, they turn unavailable when the contract
+        stops supporting them.
+        """
+        known = {entity.attr for entity in self.entities_list}
+        new_entities = [
+            entity
+            for entity in MeinVodafoneEntities(self.contract).entities_list
+            if entity.attr not in known
+        ]
+        if new_entities:
+            if self.entities_list:
+                _LOGGER.debug(
+                    "New entities for %s: %s",
+                    self.contract_id,
+                    [entity.attr for entity in new_entities],
+                )
+            self.entities_list.extend(new_entities)
+
+    def update(
+        self, usage_data: dict, timestamp: float | None = None
+    ) -> MeinVodafoneContract | None:
+        """Update usage data from MeinVodafone.
+
+        Args:
+            usage_data: The parsed usage data
+            timestamp: Server time of new usage data, None for restored data
+        """
         self.usage_data = usage_data
+        self.is_stale = False
+        if timestamp is not None:
+            data_used = data_sum(usage_data, USED)
+            self.forecast.add(timestamp, math.nan if data_used is None else data_used)
         self.contract = MeinVodafoneContract(
             contract_id=self.contract_id,
             usage_data=self.usage_data,
+            forecast=self.forecast,
         )
-        if not self.entities_list:
-            self.entities_list = MeinVodafoneEntities(self.contract).entities_list
+        if timestamp is not None:
+            self.history.record(self.contract, timestamp)
+        self._reconcile_entities()
         _LOGGER.debug(
-            "Update is completed for %s. Next update in %s",
+            "Update is completed for %s (%s writes suppressed)",
             self.contract_id,
-            self.update_interval,
+            self.suppressed_writes,
         )
         return self.contract
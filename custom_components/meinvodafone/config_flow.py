@@ -20,6 +20,7 @@ from homeassistant.helpers.selector import (
 
 from .const import CONTRACT_ID, DOMAIN
 from .MeinVodafoneAPI import MeinVodafoneAPI
+from .MeinVodafoneAPIPool import async_create_session
 
 _LOGGER = logging.getLogger(__name__)
 
@@ -77,7 +78,11 @@ class MeinVodafoneConfigFlow(config_entries.ConfigFlow, domain=DOMAIN):
 
             self.username = username
             self.password = password
-            self.api = MeinVodafoneAPI(self.username, self.password)
+            self.api = MeinVodafoneAPI(
+                self.username,
+                self.password,
+                session=async_create_session(self.hass),
+            )
 
             try:
                 async with asyncio.timeout(30):
@@ -119,8 +124,10 @@ class MeinVodafoneConfigFlow(config_entries.ConfigFlow, domain=DOMAIN):
             await self.async_set_unique_id(self.contract_id)
             self._abort_if_unique_id_configured()
 
-            # Don't close API session - it will be managed by the pool
-            # The session used during setup will be garbage collected
+            # The entry logs in through the pool, release the flow's session
+            if self.api:
+                await self.api.close()
+                self.api = None
 
             return self.async_create_entry(
                 title=self.contract_id,
@@ -141,6 +148,39 @@ class MeinVodafoneConfigFlow(config_entries.ConfigFlow, domain=DOMAIN):
             last_step=True,
         )
 
+    async def async_step_integration_discovery(
+        self, discovery_info: dict[str, Any]
+    ) -> FlowResult:
+        """Handle a new contract found on a configured account."""
+        self.username = discovery_info[CONF_USERNAME]
+        self.password = discovery_info[CONF_PASSWORD]
+        self.contract_id = discovery_info[CONTRACT_ID]
+
+        await self.async_set_unique_id(self.contract_id)
+        self._abort_if_unique_id_configured()
+
+        self.context["title_placeholders"] = {"contract_id": self.contract_id}
+        return await self.async_step_discovery_confirm()
+
+    async def async_step_discovery_confirm(
+        self, user_input: dict[str, Any] | None = None
+    ) -> FlowResult:
+        """Confirm monitoring a discovered contract."""
+        if user_input is not None:
+            return self.async_create_entry(
+                title=self.contract_id,
+                data={
+                    CONF_USERNAME: self.username,
+                    CONF_PASSWORD: self.password,
+                    CONTRACT_ID: self.contract_id,
+                },
+            )
+
+        return self.async_show_form(
+            step_id="discovery_confirm",
+            description_placeholders={"contract_id": self.contract_id},
+        )
+
     async def async_step_reauth(
         self, user_input: dict[str, Any] | None = None
     ) -> FlowResult:
@@ -163,7 +203,9 @@ class MeinVodafoneConfigFlow(config_entries.ConfigFlow, domain=DOMAIN):
             if not username or not password:
                 errors["base"] = "invalid_credentials"
             else:
-                self.api = MeinVodafoneAPI(username, password)
+                self.api = MeinVodafoneAPI(
+                    username, password, session=async_create_session(self.hass)
+                )
 
                 try:
                     async with asyncio.timeout(30):
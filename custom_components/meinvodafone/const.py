@@ -4,12 +4,40 @@ DOMAIN = "meinvodafone"
 COORDINATOR = "meinvodafone_coordinator"
 MEINVODAFONE_API = "meinvodafone_api"
 MEINVODAFONE_API_POOL = "meinvodafone_api_pool"
+ACCOUNT_COORDINATORS = "meinvodafone_account_coordinators"
+HTTP_CONNECTOR = "meinvodafone_http_connector"
 
 DEFAULT_UPDATE_INTERVAL = 15
+MIN_UPDATE_INTERVAL = 5  # minutes
+MAX_UPDATE_INTERVAL = 120  # minutes
+DISCOVERY_INTERVAL = 24  # hours
+REFRESH_DEBOUNCE = 2  # seconds requested refreshes are merged for
 MAX_UPDATE_RETRY_COUNT = 2
-REQUEST_TIMEOUT = 10
+RETRY_BASE_DELAY = 2  # seconds
+RETRY_MAX_DELAY = 30  # seconds
+CIRCUIT_FAILURE_THRESHOLD = 5
+CIRCUIT_OPEN_TIME = 300  # seconds
+CIRCUIT_MAX_OPEN_TIME = 3600  # seconds
+REQUEST_TIMEOUT = 10  # seconds per request attempt
+UPDATE_DEADLINE = 45  # seconds a refresh of an account may take in total
 MIN_LOGIN_DELAY = 5
+MIN_SESSION_LIFETIME = 300  # seconds
+SESSION_RENEWAL_FACTOR = 0.8  # of the observed session lifetime
+SESSION_LIFETIME_TTL = 86400  # seconds a learnt session lifetime is trusted
 API_TIMEOUT = 60  # seconds
+MAX_CONCURRENT_REQUESTS = 4  # per account
+MAX_POOL_CONCURRENT_REQUESTS = 8  # across all accounts
+REQUEST_RATE = 2.0  # requests per second across all accounts
+REQUEST_BURST = 10  # requests sent at once before the rate applies
+PRIORITY_INTERACTIVE = 0  # manual refreshes and setup
+PRIORITY_BACKGROUND = 1  # scheduled polls and discovery
+MAX_CONNECTIONS = 8  # open HTTP connections of all accounts
+DNS_CACHE_TTL = 300  # seconds
+KEEPALIVE_TIMEOUT = 60  # seconds
+
+STORAGE_VERSION = 1
+SNAPSHOT_SAVE_DELAY = 10  # seconds
+SESSION_SAVE_DELAY = 30  # seconds
 
 MINT_HOST = "https://www.vodafone.de/mint"
 API_HOST = "https://www.vodafone.de/api"
@@ -0,0 +1,47 @@
+"""Diagnostics support for meinvodafone integration."""
+
+from __future__ import annotations
+
+from typing import Any
+
+from homeassistant.components.diagnostics import async_redact_data
+from homeassistant.config_entries import ConfigEntry
+from homeassistant.const import CONF_PASSWORD, CONF_USERNAME
+from homeassistant.core import HomeAssistant
+
+from . import MeinVodafoneCoordinator
+from .const import COORDINATOR, DOMAIN
+
+TO_REDACT = {CONF_PASSWORD, CONF_USERNAME}
+
+
+async def async_get_config_entry_diagnostics(
+    hass: HomeAssistant, config_entry: ConfigEntry
+) -> dict[str, Any]:
+    """Return diagnostics for a config entry."""
+    coordinator: MeinVodafoneCoordinator = hass.data[DOMAIN][config_entry.entry_id][
+        COORDINATOR
+    ]
+    account_coordinator = coordinator.account_coordinator
+    circuit_breaker = coordinator.api.circuit_breaker
+
+    return {
+        "config_entry": async_redact_data(config_entry.data, TO_REDACT),
+        "contract": {
+            "last_update_success": coordinator.last_update_success,
+            "is_stale": coordinator.is_stale,
+            "suppressed_writes": coordinator.suppressed_writes,
+            "next_poll": account_coordinator.scheduler.next_poll(
+                coordinator.contract_id
+            ),
+        },
+        "account": {
+            "contracts": len(account_coordinator.contract_ids),
+            "update_interval": account_coordinator.update_interval.total_seconds()
+            if account_coordinator.update_interval
+            else None,
+            "is_authenticated": coordinator.api.is_authenticated,
+            "circuit": circuit_breaker.state if circuit_breaker else None,
+        },
+        "metrics": coordinator.metrics.as_dict(),
+    }
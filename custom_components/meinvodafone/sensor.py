@@ -2,6 +2,7 @@
 
 from __future__ import annotations
 
+from collections.abc import Callable
 import logging
 from typing import Any
 
@@ -12,11 +13,26 @@ from homeassistant.helpers.entity_platform import AddEntitiesCallback
 
 from . import MeinVodafoneCoordinator
 from .const import COORDINATOR, DOMAIN
+from .MeinVodafoneContract import LOCAL_VALUE_ATTRIBUTES, UsageItem
+from .MeinVodafoneEntities import PlanSensor, create_diagnostic_entities
 from .MeinVodafoneEntity import MeinVodafoneEntity
 
 _LOGGER = logging.getLogger(__name__)
 
 
+def _last_fetch_latency(coordinator: MeinVodafoneCoordinator) -> int | None:
+    """Return the latest fetch latency of the contract in milliseconds."""
+    latency = coordinator.metrics.last_fetch_latency.get(coordinator.contract_id)
+    return None if latency is None else round(latency * 1000)
+
+
+# Diagnostic sensor attr -> value read from the coordinator
+DIAGNOSTIC_VALUES: dict[str, Callable[[MeinVodafoneCoordinator], Any]] = {
+    "last_fetch_latency": _last_fetch_latency,
+    "login_count": lambda coordinator: coordinator.metrics.logins,
+}
+
+
 async def async_setup_entry(
     hass: HomeAssistant,
     config_entry: ConfigEntry,
@@ -27,19 +43,48 @@ async def async_setup_entry(
         COORDINATOR
     ]
 
-    if coordinator.contract:
-        # Filter and create sensor entities
-        sensors = [
-            MeinVodafoneSensor(
+    added: set[str] = set()
+
+    @callback
+    def _async_add_new_sensors() -> None:
+        """Add the sensors of entities which are not added yet."""
+        new_entities = [
+            entity
+            for entity in coordinator.entities_list
+            if entity.component == "sensor" and entity.attr not in added
+        ]
+        if not new_entities:
+            return
+
+        sensors: list[MeinVodafoneSensor] = [
+            (
+                MeinVodafonePlanSensor
+                if isinstance(entity, PlanSensor)
+                else MeinVodafoneSensor
+            )(
                 config_entry=config_entry,
                 coordinator=coordinator,
                 entity=entity,
             )
-            for entity in coordinator.entities_list
-            if entity.component == "sensor"
+            for entity in new_entities
         ]
+        if not added:
+            sensors.extend(
+                MeinVodafoneDiagnosticSensor(
+                    config_entry=config_entry,
+                    coordinator=coordinator,
+                    entity=entity,
+                )
+                for entity in create_diagnostic_entities()
+            )
+        added.update(entity.attr for entity in new_entities)
         async_add_entities(sensors)
 
+    _async_add_new_sensors()
+
+    # Containers may show up later, e.g. when an add-on pack is booked
+    config_entry.async_on_unload(coordinator.async_add_listener(_async_add_new_sensors))
+
 
 class MeinVodafoneSensor(MeinVodafoneEntity, SensorEntity):
     """MeinVodafone Sensor."""
@@ -71,10 +116,20 @@ class MeinVodafoneSensor(MeinVodafoneEntity, SensorEntity):
         self._attr_state_class = entity.state_class
         self._attr_should_poll = False
         self._attr_suggested_display_precision = entity.display_precision
+        self._attr_entity_category = entity.entity_type
+        self._attr_entity_registry_enabled_default = entity.enabled_default
 
         # Set initial value
         if coordinator.contract:
-            self._attr_native_value = getattr(coordinator.contract, entity.attr, None)
+            self._attr_native_value = self._current_value()
+
+        # State and stable attributes of the last write to the state machine
+        self._last_written_state: tuple[Any, ...] | None = None
+
+    async def async_added_to_hass(self) -> None:
+        """Remember the initial state written when the entity is added."""
+        await super().async_added_to_hass()
+        self._last_written_state = self._comparable_state()
 
     @property
     def extra_state_attributes(self) -> dict[str, Any]:
@@ -84,6 +139,10 @@ class MeinVodafoneSensor(MeinVodafoneEntity, SensorEntity):
 
         attributes: dict[str, Any] = {}
 
+        # Flag values restored from the cached snapshot until fresh data arrives
+        if self.coordinator.is_stale:
+            attributes["stale"] = True
+
         # Add last update timestamp
         last_update_attr = f"{self.attr}_last_update"
         if hasattr(self.coordinator.contract, last_update_attr):
@@ -113,8 +172,101 @@ class MeinVodafoneSensor(MeinVodafoneEntity, SensorEntity):
     @callback
     def _handle_coordinator_update(self) -> None:
         """Handle updated data from the coordinator."""
+        if self._update_state():
+            self.async_write_ha_state()
+        else:
+            self.coordinator.suppressed_writes += 1
+
+    def _update_state(self) -> bool:
+        """Update the value and return true if the state has changed."""
         if self.coordinator.contract:
-            self._attr_native_value = getattr(
-                self.coordinator.contract, self.attr, None
+            self._attr_native_value = self._current_value()
+
+        state = self._comparable_state()
+        if state == self._last_written_state:
+            return False
+        self._last_written_state = state
+        return True
+
+    def _current_value(self) -> Any:
+        """Return the current value of the sensor."""
+        return getattr(self.coordinator.contract, self.attr, None)
+
+    def _comparable_state(self) -> tuple[Any, ...]:
+        """Return the state and stable attributes to detect real changes."""
+        # The timestamp of locally derived values changes on every cycle
+        local = self.attr in LOCAL_VALUE_ATTRIBUTES
+        attributes = tuple(
+            sorted(
+                (key, value)
+                for key, value in self.extra_state_attributes.items()
+                if not (local and key == "last_update")
+            )
+        )
+        return (self.available, self._attr_native_value, attributes)
+
+
+class MeinVodafoneDiagnosticSensor(MeinVodafoneSensor):
+    """MeinVodafone sensor reporting on the refreshes of the contract."""
+
+    async def async_added_to_hass(self) -> None:
+        """Also follow account cycles which do not change the contract."""
+        await super().async_added_to_hass()
+        self.async_on_remove(
+            self.coordinator.account_coordinator.async_add_listener(
+                self._handle_coordinator_update
             )
-        self.async_write_ha_state()
+        )
+
+    @property
+    def available(self) -> bool:
+        """Return true, refresh diagnostics are always reported."""
+        return True
+
+    @property
+    def extra_state_attributes(self) -> dict[str, Any]:
+        """Return no extra attributes."""
+        return {}
+
+    @callback
+    def _handle_coordinator_update(self) -> None:
+        """Write changed diagnostics, unchanged ones are not usage writes."""
+        if self._update_state():
+            self.async_write_ha_state()
+
+    def _current_value(self) -> Any:
+        """Return the current value from the account metrics."""
+        return DIAGNOSTIC_VALUES[self.attr](self.coordinator)
+
+
+class MeinVodafonePlanSensor(MeinVodafoneSensor):
+    """MeinVodafone sensor of a single plan read from the usage item table."""
+
+    _entity: PlanSensor
+
+    @property
+    def available(self) -> bool:
+        """Return true if the plan is still part of the contract."""
+        return self._usage_item() is not None
+
+    @property
+    def extra_state_attributes(self) -> dict[str, Any]:
+        """Return the update timestamp of the plan."""
+        attributes = super().extra_state_attributes
+        item = self._usage_item()
+        if item is not None and item.last_update is not None:
+            attributes["last_update"] = item.last_update
+        return attributes
+
+    def _usage_item(self) -> UsageItem | None:
+        """Return the usage of the plan."""
+        if not self.coordinator.contract:
+            return None
+        return self.coordinator.contract.usage_item(
+            self._entity.container, self._entity.plan
+        )
+
+    def _current_value(self) -> Any:
+        """Return the metric of the plan."""
+        item = self._usage_item()
+        return None if item is None else getattr(item, self._entity.metric)
@@ -0,0 +1,93 @@
+"""Services of the meinvodafone integration."""
+
+from __future__ import annotations
+
+import logging
+
+import voluptuous as vol
+
+from homeassistant.const import ATTR_DEVICE_ID
+from homeassistant.core import HomeAssistant, ServiceCall, callback
+from homeassistant.exceptions import ServiceValidationError
+from homeassistant.helpers import config_validation as cv, device_registry as dr
+
+from .const import ACCOUNT_COORDINATORS, CONTRACT_ID, DOMAIN
+from .MeinVodafoneAccountCoordinator import MeinVodafoneAccountCoordinator
+
+_LOGGER = logging.getLogger(__name__)
+
+SERVICE_REFRESH = "refresh"
+ATTR_ACCOUNT = "account"
+
+REFRESH_SCHEMA = vol.All(
+    vol.Schema(
+        {
+            vol.Optional(CONTRACT_ID): vol.All(cv.ensure_list, [cv.string]),
+            vol.Optional(ATTR_DEVICE_ID): vol.All(cv.ensure_list, [cv.string]),
+            vol.Optional(ATTR_ACCOUNT): vol.All(cv.ensure_list, [cv.string]),
+        }
+    ),
+    cv.has_at_least_one_key(CONTRACT_ID, ATTR_DEVICE_ID, ATTR_ACCOUNT),
+)
+
+
+@callback
+def async_setup_services(hass: HomeAssistant) -> None:
+    """Register the services of the integration."""
+
+    async def async_refresh(call: ServiceCall) -> None:
+        """Request a refresh of contracts, devices or whole accounts.
+
+        The contracts are queued on their account coordinator, which fetches
+        all contracts requested within a short window in one batch.
+        """
+        account_coordinators: dict[str, MeinVodafoneAccountCoordinator] = hass.data.get(
+            DOMAIN, {}
+        ).get(ACCOUNT_COORDINATORS, {})
+
+        contract_ids = set(call.data.get(CONTRACT_ID, []))
+
+        device_registry = dr.async_get(hass)
+        for device_id in call.data.get(ATTR_DEVICE_ID, []):
+            device = device_registry.async_get(device_id)
+            identifiers = [
+                identifier
+                for domain, identifier in (device.identifiers if device else ())
+                if domain == DOMAIN
+            ]
+            if not identifiers:
+                raise ServiceValidationError(
+                    f"Device {device_id} is not a MeinVodafone contract"
+                )
+            contract_ids.update(identifiers)
+
+        requested: dict[str, set[str]] = {}
+        for username in call.data.get(ATTR_ACCOUNT, []):
+            if username not in account_coordinators:
+                raise ServiceValidationError(f"Unknown MeinVodafone account {username}")
+            requested[username] = set(account_coordinators[username].contract_ids)
+
+        for contract_id in contract_ids:
+            username = next(
+                (
+                    username
+                    for username, coordinator in account_coordinators.items()
+                    if contract_id in coordinator.contract_ids
+                ),
+                None,
+            )
+            if username is None:
+                raise ServiceValidationError(
+                    f"Unknown MeinVodafone contract {contract_id}"
+                )
+            requested.setdefault(username, set()).add(contract_id)
+
+        for username, requested_ids in requested.items():
+            _LOGGER.debug("Refresh of %s requested for %s", requested_ids, username)
+            account_coordinators[username].async_request_contracts_refresh(
+                requested_ids
+            )
+
+    hass.services.async_register(
+        DOMAIN, SERVICE_REFRESH, async_refresh, schema=REFRESH_SCHEMA
+    )
@@ -0,0 +1,93 @@
+"""Tests of the circuit breaker around contract usage fetches."""
+
+from __future__ import annotations
+
+import asyncio
+from unittest.mock import MagicMock
+
+import pytest
+
+from custom_components.meinvodafone.MeinVodafoneAPI import MeinVodafoneAPI
+from custom_components.meinvodafone.MeinVodafoneAPIPool import CircuitBreaker
+
+
+def _half_open_api() -> tuple[MeinVodafoneAPI, CircuitBreaker]:
+    """Return an API whose circuit lets the next request probe."""
+    breaker = CircuitBreaker("user", failure_threshold=1, open_time=0)
+    breaker.record_failure()
+    api = MeinVodafoneAPI(
+        "user", "secret", circuit_breaker=breaker, session=MagicMock()
+    )
+    return api, breaker
+
+
+def test_probe_cancelled_at_deadline_is_released() -> None:
+    """A probe cancelled by the cycle deadline lets the next request probe."""
+
+    async def run() -> None:
+        api, breaker = _half_open_api()
+        started = asyncio.Event()
+
+        async def hang(contract_number: str, deadline: float | None) -> dict:
+            started.set()
+            await asyncio.sleep(3600)
+            return {}
+
+        api._get_contract_usage = hang
+
+        loop = asyncio.get_running_loop()
+        with pytest.raises(TimeoutError):
+            async with asyncio.timeout_at(loop.time() + 0.05):
+                await api.get_contract_usage("123")
+        assert started.is_set()
+
+        # Let the cancelled fetch unwind
+        for _ in range(5):
+            await asyncio.sleep(0)
+        assert breaker.allow_request()
+
+    asyncio.run(run())
+
+
+def test_probe_outcome_is_recorded() -> None:
+    """A finished probe closes the circuit again."""
+
+    async def run() -> None:
+        api, breaker = _half_open_api()
+
+        async def succeed(contract_number: str, deadline: float | None) -> dict:
+            return {"status_code": 200, "usage_data": {}}
+
+        api._get_contract_usage = succeed
+
+        result = await api.get_contract_usage("123")
+        assert result["status_code"] == 200
+        assert breaker.failures == 0
+        assert breaker.allow_request()
+
+    asyncio.run(run())
+
+
+def test_long_retry_after_is_not_cut_short() -> None:
+    """A Retry-After beyond the maximum delay pauses requests until then."""
+
+    async def run() -> None:
+        breaker = CircuitBreaker("user")
+        api = MeinVodafoneAPI(
+            "user", "secret", circuit_breaker=breaker, session=MagicMock()
+        )
+        calls = 0
+
+        async def throttled(contract_number: str, deadline: float | None) -> dict:
+            nonlocal calls
+            calls += 1
+            return {"status_code": 429, "retry_after": 600.0}
+
+        api._get_contract_usage = throttled
+
+        result = await api.get_contract_usage("123")
+        assert result["status_code"] == 429
+        assert calls == 1
+        assert not breaker.allow_request()
+
+    asyncio.run(run())
@@ -0,0 +1,55 @@
+"""Tests of the request budgets of an account."""
+
+from __future__ import annotations
+
+import asyncio
+from unittest.mock import MagicMock
+
+from custom_components.meinvodafone.const import (
+    PRIORITY_BACKGROUND,
+    PRIORITY_INTERACTIVE,
+)
+from custom_components.meinvodafone.MeinVodafoneAPI import MeinVodafoneAPI
+from custom_components.meinvodafone.MeinVodafoneAPIPool import RequestBudget
+
+
+def test_interactive_request_overtakes_queued_polls_of_the_account() -> None:
+    """The account's request slot is granted by priority."""
+
+    async def run() -> None:
+        api = MeinVodafoneAPI(
+            "user",
+            "secret",
+            session=MagicMock(),
+            request_budget=RequestBudget(1000, 10, 8),
+            account_budget=RequestBudget(None, 0, 1),
+        )
+        order: list[str] = []
+        running = asyncio.Event()
+        release = asyncio.Event()
+
+        async def fetch(contract_number: str, deadline: float | None) -> dict:
+            if contract_number == "running":
+                running.set()
+                await release.wait()
+            order.append(contract_number)
+            return {"status_code": 200, "usage_data": {}}
+
+        api._get_contract_usage = fetch
+
+        tasks = [asyncio.create_task(api.get_contract_usage("running"))]
+        await running.wait()
+        tasks.append(
+            asyncio.create_task(api.get_contract_usage("poll", PRIORITY_BACKGROUND))
+        )
+        await asyncio.sleep(0)
+        tasks.append(
+            asyncio.create_task(api.get_contract_usage("service", PRIORITY_INTERACTIVE))
+        )
+        await asyncio.sleep(0)
+
+        release.set()
+        await asyncio.gather(*tasks)
+        assert order == ["running", "service", "poll"]
+
+    asyncio.run(run())
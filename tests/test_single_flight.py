@@ -0,0 +1,37 @@
+"""Tests of concurrent usage fetches of the same contract."""
+
+from __future__ import annotations
+
+import asyncio
+from unittest.mock import MagicMock
+
+from custom_components.meinvodafone.MeinVodafoneAPI import MeinVodafoneAPI
+
+
+def test_caller_after_cancelled_fetch_starts_anew() -> None:
+    """A caller arriving while an abandoned fetch unwinds is not cancelled."""
+
+    async def run() -> None:
+        api = MeinVodafoneAPI("user", "secret", session=MagicMock())
+        calls = 0
+
+        async def fetch(contract_number: str, deadline: float | None) -> dict:
+            nonlocal calls
+            calls += 1
+            await asyncio.sleep(0.01)
+            return {"status_code": 200, "usage_data": {}}
+
+        api._get_contract_usage = fetch
+
+        first = asyncio.create_task(api.get_contract_usage("123"))
+        await asyncio.sleep(0)
+        first.cancel()
+        # The only caller leaves, the shared fetch is cancelled
+        await asyncio.sleep(0)
+
+        result = await api.get_contract_usage("123")
+        assert result["status_code"] == 200
+        assert calls == 2
+        assert first.cancelled()
+
+    asyncio.run(run())